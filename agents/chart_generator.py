@@ -4,18 +4,45 @@ Chart_Generator Agent
 LangGraph 노드 함수들로 구성
 LangChain Runnable 기반으로 LangSmith 트레이싱 지원
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
 from pathlib import Path
+import os
+import re
+import hashlib
 from state import AgentState
+from agents.stock_analyzer import snapshots_to_soa
+from services.jsonutil import dumps_bytes
 from langchain_core.runnables import chain
 import matplotlib
 matplotlib.use('Agg')  # GUI 없이 백그라운드에서 실행
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 
-def _setup_korean_font():
-    """한글 폰트 설정"""
+# 트렌드 라벨의 인용 번호([n]) 제거용
+_CITE_RE = re.compile(r'\[\d+\]')
+
+# 모든 차트가 공유하는 Figure/Axes (pyplot 상태 머신·Figure 생성 비용 회피)
+_FIG = Figure(figsize=(10, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+
+# 세로 막대 차트(45° 회전 x축 라벨)용 고정 여백 — tight_layout 렌더러 패스 회피
+_BAR_LAYOUT = {"left": 0.1, "right": 0.95, "top": 0.9, "bottom": 0.2}
+# 시장 트렌드 차트 여백 캐시: (라벨 튜플, subplot 파라미터) — 라벨이 바뀌면 다시 계산
+_MARKET_LAYOUT: Optional[Tuple[Tuple[str, ...], Dict[str, float]]] = None
+
+
+@lru_cache(maxsize=1)
+def _setup_korean_font() -> Optional[fm.FontProperties]:
+    """
+    한글 폰트 설정 (프로세스당 1회만 수행)
+    폰트 경로 탐색·FontProperties 생성·rcParams 갱신 결과를 캐시하여
+    render_charts 반복 호출 시 중복 작업을 피합니다.
+    """
     try:
         # 한글 폰트 경로 시도
         font_paths = [
@@ -29,11 +56,71 @@ def _setup_korean_font():
                 font_prop = fm.FontProperties(fname=font_path)
                 plt.rcParams['font.family'] = font_prop.get_name()
                 print(f"[Chart_Generator] Korean font loaded: {font_path}")
-                break
-        else:
-            print("[Chart_Generator] Korean font not found, using default")
+                return font_prop
+        print("[Chart_Generator] Korean font not found, using default")
     except Exception as e:
         print(f"[Chart_Generator] Font setup failed: {e}")
+    return None
+
+
+def _acquire_axes():
+    """공유 Axes를 초기화하여 반환 (Figure 재생성 없이 재사용)"""
+    _AX.clear()
+    return _FIG, _AX
+
+
+def _apply_market_layout(fig, labels: List[str]):
+    """
+    트렌드 라벨 폭에 맞춘 여백을 tight_layout으로 계산하고,
+    같은 라벨 집합이면 캐시한 subplot 파라미터를 재사용 (렌더러 패스 생략)
+    라벨이 달라지면 (길이 변화로 잘리지 않도록) 다시 계산합니다.
+    """
+    global _MARKET_LAYOUT
+    key = tuple(labels)
+    if _MARKET_LAYOUT is not None and _MARKET_LAYOUT[0] == key:
+        fig.subplots_adjust(**_MARKET_LAYOUT[1])
+        return
+    fig.tight_layout(pad=0.5)
+    sp = fig.subplotpars
+    _MARKET_LAYOUT = (key, {"left": sp.left, "right": sp.right, "top": sp.top, "bottom": sp.bottom})
+
+
+def _chart_path(out_dir: Path, chart_id: str, data: Any) -> Path:
+    """
+    차트 입력 데이터 해시를 파일명에 포함한 PNG 경로
+    동일 데이터로 이미 렌더링된 파일이 있으면 재사용할 수 있습니다.
+    """
+    payload = dumps_bytes(data, sort_keys=True)
+    key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return out_dir / f"{chart_id}-{key}.png"
+
+
+def _prune_stale_charts(out_dir: Path, chart_id: str, keep: Path) -> None:
+    """같은 차트 id의 이전 해시 PNG(및 중단된 임시 파일) 삭제 (outputs/charts 누적 방지)"""
+    pattern = re.compile(rf"{re.escape(chart_id)}-[0-9a-f]{{32}}\.png(\.tmp)?")
+    for p in out_dir.glob(f"{chart_id}-*"):
+        if p.name != keep.name and pattern.fullmatch(p.name):
+            try:
+                p.unlink()
+            except OSError as e:
+                print(f"[Chart_Generator] WARNING: Failed to remove stale chart {p}: {e}")
+
+
+def _save_chart(fig, chart_path: Path) -> Path:
+    """
+    차트를 PNG로 저장
+    - 여백은 렌더링 전에 이미 고정되므로 bbox_inches='tight'(2회 렌더링) 생략
+    - 리포트용 중간 산출물이므로 PNG 압축 레벨을 낮춰 인코딩 시간 단축
+    - 임시 파일에 쓴 뒤 os.replace로 교체 (중단 시 잘린 PNG가 캐시로 재사용되지 않도록)
+    """
+    tmp_path = chart_path.with_name(chart_path.name + ".tmp")
+    try:
+        fig.savefig(tmp_path, format="png", dpi=150, pil_kwargs={"compress_level": 1})
+        os.replace(tmp_path, chart_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return chart_path
 
 
 @chain
@@ -78,45 +165,68 @@ def select_chart_specs(state: AgentState) -> Dict[str, Any]:
     return {"_chart_specs": chart_specs}
 
 
+def _stock_soa(state: AgentState) -> Dict[str, Any]:
+    """
+    주가 차트용 SoA 뷰. compute_snapshots가 만든 _stock_snapshots_soa가 없으면
+    (수동 구성 state 등) stock_snapshots에서 다시 구성합니다.
+    """
+    soa = state.get("_stock_snapshots_soa") or {}
+    if len(soa.get("ticker", [])) == 0 and state.get("stock_snapshots"):
+        soa = snapshots_to_soa(state["stock_snapshots"])
+    return soa
+
+
 @chain
 def render_charts(state: AgentState) -> Dict[str, Any]:
     """
     차트를 렌더링하는 노드
+    차트 수가 적으므로 공유 Figure(_FIG/_CANVAS)로 프로세스 내에서 순차 렌더링합니다.
     LangChain Runnable로 래핑되어 LangSmith에 트레이싱됩니다.
     """
     print(f"[Chart_Generator] render_charts")
 
+    chart_specs = state.get("_chart_specs", [])
+
+    # 빠른 경로: 그릴 데이터가 없으면 출력 디렉토리·폰트 초기화를 건드리지 않음
+    has_any = bool(
+        state.get("stock_snapshots")
+        or state.get("market_brief", {}).get("top_trends")
+        or state.get("company_dossiers")
+    )
+    if not chart_specs or not has_any:
+        print(f"[Chart_Generator] No chart data, skipping render")
+        return {"charts": []}
+
     _setup_korean_font()
 
-    chart_specs = state.get("_chart_specs", [])
     chart_entries = []
     out_dir = Path("outputs/charts")
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # 섹션별 렌더러와 렌더링에 필요한 데이터
+    renderers = {
+        "stock": (_render_stock_returns_chart, _stock_soa(state)),
+        "market": (_render_market_trends_chart, state.get("market_brief", {}).get("top_trends", [])),
+        "company": (_render_company_highlights_chart, state.get("company_dossiers", [])),
+    }
+
     for spec in chart_specs:
-        chart_id = spec["id"]
-        kind = spec["kind"]
-        title = spec["title"]
         section = spec["section"]
-
+        if section not in renderers:
+            print(f"[Chart_Generator] Unknown section: {section}")
+            continue
+        render_fn, data = renderers[section]
+        chart_id = spec["id"]
         try:
-            if section == "stock":
-                chart_path = _render_stock_returns_chart(state, out_dir, chart_id, title)
-            elif section == "market":
-                chart_path = _render_market_trends_chart(state, out_dir, chart_id, title)
-            elif section == "company":
-                chart_path = _render_company_highlights_chart(state, out_dir, chart_id, title)
-            else:
-                print(f"[Chart_Generator] Unknown section: {section}")
-                continue
-
+            chart_path = render_fn(data, out_dir, chart_id, spec["title"])
             if chart_path:
+                _prune_stale_charts(out_dir, chart_id, chart_path)
                 chart_entries.append({
                     "id": chart_id,
-                    "kind": kind,
+                    "kind": spec["kind"],
                     "path": str(chart_path),
-                    "alt": title,
-                    "section": section
+                    "alt": spec["title"],
+                    "section": spec["section"]
                 })
                 print(f"[Chart_Generator] Created chart: {chart_path}")
         except Exception as e:
@@ -125,16 +235,20 @@ def render_charts(state: AgentState) -> Dict[str, Any]:
     return {"charts": chart_entries}
 
 
-def _render_stock_returns_chart(state: AgentState, out_dir: Path, chart_id: str, title: str) -> Path:
-    """주가 수익률 차트 생성"""
-    snapshots = state.get("stock_snapshots", [])
-    if not snapshots:
+def _render_stock_returns_chart(snapshots_soa: Dict[str, Any], out_dir: Path, chart_id: str, title: str) -> Optional[Path]:
+    """주가 수익률 차트 생성 (compute_snapshots의 SoA 뷰를 그대로 사용)"""
+    if len(snapshots_soa.get("ticker", [])) == 0:
         return None
 
-    tickers = [s.get("ticker", "N/A") for s in snapshots]
-    returns = [s.get("period_return_pct", 0.0) for s in snapshots]
+    # SoA 컬럼은 NumPy 배열 또는 (NumPy 미설치 시) 리스트 → 파이썬 값으로 통일
+    tickers = [str(t) for t in snapshots_soa["ticker"]]
+    returns = [float(r) for r in snapshots_soa["period_return_pct"]]
+
+    chart_path = _chart_path(out_dir, chart_id, [title, tickers, returns])
+    if chart_path.exists():
+        return chart_path
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _acquire_axes()
     colors = ['green' if r >= 0 else 'red' for r in returns]
     ax.bar(tickers, returns, color=colors, alpha=0.7)
     ax.set_xlabel('Ticker', fontsize=12)
@@ -142,29 +256,22 @@ def _render_stock_returns_chart(state: AgentState, out_dir: Path, chart_id: str,
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
     ax.grid(axis='y', alpha=0.3)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.subplots_adjust(**_BAR_LAYOUT)
 
-    chart_path = out_dir / f"{chart_id}.png"
-    plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-    plt.close(fig)
-    return chart_path
+    return _save_chart(fig, chart_path)
 
 
-def _render_market_trends_chart(state: AgentState, out_dir: Path, chart_id: str, title: str) -> Path:
+def _render_market_trends_chart(trends: List[str], out_dir: Path, chart_id: str, title: str) -> Optional[Path]:
     """시장 트렌드 차트 생성"""
-    market_brief = state.get("market_brief", {})
-    trends = market_brief.get("top_trends", [])
-
     if not trends:
         return None
 
     # 트렌드 텍스트를 짧게 자르기 (인용 번호 제거)
-    import re
     trend_labels = []
     for t in trends[:5]:  # 최대 5개만
         # 인용 번호 제거
-        clean_text = re.sub(r'\[\d+\]', '', t)
+        clean_text = _CITE_RE.sub('', t)
         # 50자로 제한
         if len(clean_text) > 50:
             clean_text = clean_text[:47] + "..."
@@ -176,7 +283,11 @@ def _render_market_trends_chart(state: AgentState, out_dir: Path, chart_id: str,
         print(f"[Chart_Generator] Skipping chart generation due to error in trend data")
         return None
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    chart_path = _chart_path(out_dir, chart_id, [title, trend_labels])
+    if chart_path.exists():
+        return chart_path
+
+    fig, ax = _acquire_axes()
     y_pos = range(len(trend_labels))
     values = [len(trend_labels) - i for i in range(len(trend_labels))]  # 중요도를 숫자로 표현
 
@@ -186,42 +297,33 @@ def _render_market_trends_chart(state: AgentState, out_dir: Path, chart_id: str,
     ax.set_xlabel('Importance Ranking', fontsize=12)
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.grid(axis='x', alpha=0.3)
-    plt.tight_layout()
+    _apply_market_layout(fig, trend_labels)
 
-    chart_path = out_dir / f"{chart_id}.png"
-    plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-    plt.close(fig)
-    return chart_path
+    return _save_chart(fig, chart_path)
 
 
-def _render_company_highlights_chart(state: AgentState, out_dir: Path, chart_id: str, title: str) -> Path:
+def _render_company_highlights_chart(dossiers: List[Dict[str, Any]], out_dir: Path, chart_id: str, title: str) -> Optional[Path]:
     """기업 하이라이트 차트 생성"""
-    dossiers = state.get("company_dossiers", [])
     if not dossiers:
         return None
 
-    tickers = []
-    highlight_counts = []
+    tickers = [d.get("ticker", "N/A") for d in dossiers]
+    highlight_counts = [len(d.get("business_highlights", [])) for d in dossiers]
 
-    for d in dossiers:
-        ticker = d.get("ticker", "N/A")
-        highlights = d.get("business_highlights", [])
-        tickers.append(ticker)
-        highlight_counts.append(len(highlights))
+    chart_path = _chart_path(out_dir, chart_id, [title, tickers, highlight_counts])
+    if chart_path.exists():
+        return chart_path
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _acquire_axes()
     ax.bar(tickers, highlight_counts, color='coral', alpha=0.7)
     ax.set_xlabel('Company', fontsize=12)
     ax.set_ylabel('Number of Highlights', fontsize=12)
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.grid(axis='y', alpha=0.3)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.subplots_adjust(**_BAR_LAYOUT)
 
-    chart_path = out_dir / f"{chart_id}.png"
-    plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-    plt.close(fig)
-    return chart_path
+    return _save_chart(fig, chart_path)
 
 
 @chain
@@ -232,11 +334,17 @@ def register_chart_assets(state: AgentState) -> Dict[str, Any]:
     """
     print(f"[Chart_Generator] register_chart_assets")
 
+    # 실제로 렌더링된 차트 경로만 등록 (주가 수익률 차트 우선)
+    charts = [c for c in state.get("charts", []) if c.get("path") and Path(c["path"]).exists()]
+    if not charts:
+        return {"evidence_map": []}
+    chart = next((c for c in charts if c.get("section") == "stock"), charts[0])
+
     evidence_entry = {
         "section": "chart",
         "n": 99,
         "title": "Internal chart",
-        "url": "outputs/charts/returns.png",
+        "url": chart["path"],
         "date": state["snapshot_date"]
     }
 
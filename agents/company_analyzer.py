@@ -11,6 +11,15 @@ from services import rag
 from langchain_core.runnables import chain
 
 
+# 기업별 관점(aspect)과 RAG 검색 키워드
+_ASPECTS = ("business", "risk", "roadmap")
+_QUERY_TEMPLATES = {
+    "business": "business strategy pricing margin",
+    "risk": "risk regulation subsidy supply chain",
+    "roadmap": "roadmap model pipeline capacity expansion",
+}
+
+
 @chain
 def collect_company_docs(state: AgentState) -> Dict[str, Any]:
     """
@@ -51,6 +60,23 @@ def index_company_docs(state: AgentState) -> Dict[str, Any]:
     }
 
 
+def _materialize_refs(passages, refs, base_n: int, snapshot_date: str):
+    """
+    LLM이 참조한 문서 번호(1부터 시작)를 evidence 엔트리로 변환
+    범위를 벗어난 번호는 무시하고, base_n부터 순서대로 번호를 부여합니다.
+    """
+    picked = [passages[r - 1] for r in refs if 0 <= r - 1 < len(passages)]
+    return [
+        {
+            "n": base_n + i,
+            "title": p.get("title", "Untitled"),
+            "url": p.get("url", "N/A"),
+            "date": p.get("date", snapshot_date),
+        }
+        for i, p in enumerate(picked)
+    ]
+
+
 @chain
 def compose_company_dossiers(state: AgentState) -> Dict[str, Any]:
     """
@@ -58,7 +84,7 @@ def compose_company_dossiers(state: AgentState) -> Dict[str, Any]:
     """
     print(f"[Company_Analyzer] compose_company_dossiers")
 
-    from services.llm import summarize_company_info
+    from services.llm import summarize_company_info_batch
 
     idx = state.get("_company_index")
     dossiers = []
@@ -66,31 +92,37 @@ def compose_company_dossiers(state: AgentState) -> Dict[str, Any]:
     # Company 에이전트는 100부터 시작 (market과 겹치지 않도록)
     start_n = 100
 
-    for tk in state.get("benchmarks", []):
-        # 회사별 쿼리(간단 키워드 기반)
-        biz_passages = rag.query(
-            idx,
-            f"{tk} business strategy pricing margin",
-            filters={"company": [tk]},
-            top_k=4
-        )
-        risk_passages = rag.query(
-            idx,
-            f"{tk} risk regulation subsidy supply chain",
-            filters={"company": [tk]},
-            top_k=4
-        )
-        roadmap_passages = rag.query(
-            idx,
-            f"{tk} roadmap model pipeline capacity expansion",
-            filters={"company": [tk]},
-            top_k=4
-        )
+    benchmarks = state.get("benchmarks", [])
+
+    # 회사별 쿼리(간단 키워드 기반) - 전체 티커 × 관점을 한 번의 인덱스 순회로 검색
+    requests = [
+        (f"{tk} {_QUERY_TEMPLATES[aspect]}", {"company": [tk]})
+        for tk in benchmarks
+        for aspect in _ASPECTS
+    ]
+    results = rag.query_batch(idx, requests, top_k=4) if requests else []
+    passages_by_key = {
+        (tk, aspect): results[i * len(_ASPECTS) + j]
+        for i, tk in enumerate(benchmarks)
+        for j, aspect in enumerate(_ASPECTS)
+    }
+
+    # LLM으로 실제 요약 (referenced_docs 포함)
+    # 티커 × 관점별 요약은 서로 독립적인 LLM 호출이므로 하나의 LLM 인스턴스로 한 번에 배치 실행
+    keys = list(passages_by_key)
+    batch = summarize_company_info_batch(
+        [(tk, passages_by_key[(tk, aspect)], aspect) for tk, aspect in keys]
+    )
+    summaries = dict(zip(keys, batch))
+
+    for tk in benchmarks:
+        biz_passages = passages_by_key[(tk, "business")]
+        risk_passages = passages_by_key[(tk, "risk")]
+        roadmap_passages = passages_by_key[(tk, "roadmap")]
 
-        # LLM으로 실제 요약 (referenced_docs 포함)
-        business_result = summarize_company_info(tk, biz_passages, "business")
-        risks_result = summarize_company_info(tk, risk_passages, "risk")
-        roadmap_result = summarize_company_info(tk, roadmap_passages, "roadmap")
+        business_result = summaries[(tk, "business")]
+        risks_result = summaries[(tk, "risk")]
+        roadmap_result = summaries[(tk, "roadmap")]
 
         # LLM 응답에서 points와 referenced_docs 추출
         business_points = business_result.get("points", []) if isinstance(business_result, dict) else business_result
@@ -102,44 +134,11 @@ def compose_company_dossiers(state: AgentState) -> Dict[str, Any]:
         roadmap_points = roadmap_result.get("points", []) if isinstance(roadmap_result, dict) else roadmap_result
         roadmap_refs = roadmap_result.get("referenced_docs", []) if isinstance(roadmap_result, dict) else []
 
-        # evidence 맵 생성: LLM이 참조한 문서만 포함
-        ev = []
-
-        # business 섹션의 참조 문서
-        for doc_num in business_refs:
-            doc_idx = doc_num - 1
-            if 0 <= doc_idx < len(biz_passages):
-                doc = biz_passages[doc_idx]
-                ev.append({
-                    "n": start_n + len(ev),
-                    "title": doc.get("title", "Untitled"),
-                    "url": doc.get("url", "N/A"),
-                    "date": doc.get("date", state.get("snapshot_date", "N/A"))
-                })
-
-        # risk 섹션의 참조 문서
-        for doc_num in risks_refs:
-            doc_idx = doc_num - 1
-            if 0 <= doc_idx < len(risk_passages):
-                doc = risk_passages[doc_idx]
-                ev.append({
-                    "n": start_n + len(ev),
-                    "title": doc.get("title", "Untitled"),
-                    "url": doc.get("url", "N/A"),
-                    "date": doc.get("date", state.get("snapshot_date", "N/A"))
-                })
-
-        # roadmap 섹션의 참조 문서
-        for doc_num in roadmap_refs:
-            doc_idx = doc_num - 1
-            if 0 <= doc_idx < len(roadmap_passages):
-                doc = roadmap_passages[doc_idx]
-                ev.append({
-                    "n": start_n + len(ev),
-                    "title": doc.get("title", "Untitled"),
-                    "url": doc.get("url", "N/A"),
-                    "date": doc.get("date", state.get("snapshot_date", "N/A"))
-                })
+        # evidence 맵 생성: LLM이 참조한 문서만 포함 (business → risk → roadmap 순 번호 부여)
+        snapshot_date = state.get("snapshot_date", "N/A")
+        ev = _materialize_refs(biz_passages, business_refs, start_n, snapshot_date)
+        ev += _materialize_refs(risk_passages, risks_refs, start_n + len(ev), snapshot_date)
+        ev += _materialize_refs(roadmap_passages, roadmap_refs, start_n + len(ev), snapshot_date)
 
         dossiers.append({
             "ticker": tk,
@@ -166,16 +165,17 @@ def validate_citations_company(state: AgentState) -> Dict[str, Any]:
     """
     print(f"[Company_Analyzer] validate_citations_company")
 
-    evidence_entries = []
-    for d in state.get("company_dossiers", []):
-        for e in d.get("evidence", []):
-            evidence_entries.append({
-                "section": "company",
-                "n": e["n"],
-                "title": e["title"],
-                "url": e["url"],
-                "date": e["date"],
-                "ticker": d["ticker"],
-            })
+    evidence_entries = [
+        {
+            "section": "company",
+            "n": e["n"],
+            "title": e["title"],
+            "url": e["url"],
+            "date": e["date"],
+            "ticker": d["ticker"],
+        }
+        for d in state.get("company_dossiers", [])
+        for e in d.get("evidence", [])
+    ]
 
     return {"evidence_map": evidence_entries}
@@ -134,14 +134,15 @@ def validate_citations_market(state: AgentState) -> Dict[str, Any]:
     """
     print(f"[Market_Researcher] validate_citations_market")
 
-    evidence_entries = []
-    for e in state["market_brief"].get("evidence", []):
-        evidence_entries.append({
+    evidence_entries = [
+        {
             "section": "market",
             "n": e["n"],
             "title": e["title"],
             "url": e["url"],
             "date": e["date"]
-        })
+        }
+        for e in state["market_brief"].get("evidence", [])
+    ]
 
     return {"evidence_map": evidence_entries}
@@ -4,17 +4,86 @@ Stock_Analyzer Agent
 LangGraph 노드 함수들로 구성
 LangChain Runnable 기반으로 LangSmith 트레이싱 지원
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import copy
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성: 없으면 SoA 컬럼을 파이썬 리스트로 구성
+    np = None
+
 from state import AgentState
 from services.finance import (
-    fetch_price_series,
+    fetch_price_series_bulk,
     compute_return_and_vol,
-    fetch_fundamentals,
+    fetch_fundamentals_bulk,
     ensure_currency,
 )
 from langchain_core.runnables import chain
 
 
+# 조회 결과 캐시: (ticker, period, snapshot_date) → 가격 시계열, (ticker, snapshot_date) → 기초 재무
+# 항목 수 상한(LRU)을 두고, 조회 시 복사본을 반환 (호출 측 수정이 캐시를 오염시키지 않도록)
+_MEMO_MAXSIZE = 256
+_SERIES_MEMO: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+_FUNDS_MEMO: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+def _memo_get(memo: Dict[Tuple, Dict[str, Any]], key: Tuple) -> Optional[Dict[str, Any]]:
+    """캐시 조회 (최근 사용으로 갱신, 복사본 반환)"""
+    value = memo.pop(key, None)
+    if value is None:
+        return None
+    memo[key] = value
+    return copy.deepcopy(value)
+
+
+def _memo_put(memo: Dict[Tuple, Dict[str, Any]], key: Tuple, value: Dict[str, Any]) -> None:
+    """캐시 저장 (상한 초과 시 가장 오래전에 사용한 항목부터 제거)"""
+    memo.pop(key, None)
+    memo[key] = copy.deepcopy(value)
+    while len(memo) > _MEMO_MAXSIZE:
+        memo.pop(next(iter(memo)))
+
+
+@lru_cache(maxsize=256)
+def _return_and_vol_for_closes(closes: Tuple[float, ...]) -> Tuple[float, float]:
+    return compute_return_and_vol({"close": list(closes)})
+
+
+def _cached_return_and_vol(series: Dict[str, Any]) -> Tuple[float, float]:
+    """
+    종가 시퀀스가 같으면 compute_return_and_vol 결과를 재사용
+    (compute_snapshots와 validate_financial_consistency의 중복 계산 제거)
+    """
+    return _return_and_vol_for_closes(tuple(series.get("close", [])))
+
+
+def snapshots_to_soa(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    stock_snapshots 리스트 → SoA(struct-of-arrays) 컬럼 배열 뷰
+    (공개 state인 stock_snapshots는 파이썬 float 유지, float32는 SoA 배열에만 사용)
+    NumPy가 없으면 같은 키의 파이썬 리스트를 반환합니다.
+    """
+    multiples = [s.get("multiples") or {} for s in snapshots]
+    tickers = [s.get("ticker", "N/A") for s in snapshots]
+    returns = [s.get("period_return_pct", 0.0) for s in snapshots]
+    vols = [s.get("volatility", 0.0) for s in snapshots]
+    pers = [m.get("PER") for m in multiples]
+    eps = [m.get("EPS_TTM") for m in multiples]
+    if np is None:
+        return {"ticker": tickers, "period_return_pct": returns, "volatility": vols, "per": pers, "eps_ttm": eps}
+    return {
+        "ticker": np.array(tickers, dtype=str),
+        "period_return_pct": np.asarray(returns, dtype=np.float32),
+        "volatility": np.asarray(vols, dtype=np.float32),
+        "per": np.asarray(pers, dtype=float),
+        "eps_ttm": np.asarray(eps, dtype=float),
+    }
+
+
 @chain
 def fetch_prices_financials(state: AgentState) -> Dict[str, Any]:
     """
@@ -23,12 +92,41 @@ def fetch_prices_financials(state: AgentState) -> Dict[str, Any]:
     print(f"[Stock_Analyzer] fetch_prices_financials - benchmarks: {state.get('benchmarks', [])}")
 
     tickers = state.get("benchmarks", []) or []
+    period = state.get("period", "last_90d")
+    snapshot_date = state.get("snapshot_date", "")
     series_cache = {}
     fund_cache = {}
 
-    for tk in tickers:
-        series_cache[tk] = fetch_price_series(tk, state.get("period", "last_90d"))
-        fund_cache[tk] = fetch_fundamentals(tk)
+    if not tickers:
+        return {"_series": series_cache, "_funds": fund_cache}
+
+    # 캐시 적중분은 복사본으로 채우고, 없는 티커만 모아 bulk 조회 1회씩 (티커 수와 무관하게 왕복 1회)
+    for tk in dict.fromkeys(tickers):
+        series = _memo_get(_SERIES_MEMO, (tk, period, snapshot_date))
+        if series is not None:
+            series_cache[tk] = series
+        funds = _memo_get(_FUNDS_MEMO, (tk, snapshot_date))
+        if funds is not None:
+            fund_cache[tk] = funds
+    missing_series = [tk for tk in dict.fromkeys(tickers) if tk not in series_cache]
+    missing_funds = [tk for tk in dict.fromkeys(tickers) if tk not in fund_cache]
+
+    # 시세/재무 bulk 조회는 서로 독립적인 I/O이므로 동시에 실행
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        series_future = ex.submit(fetch_price_series_bulk, missing_series, period) if missing_series else None
+        funds_future = ex.submit(fetch_fundamentals_bulk, missing_funds) if missing_funds else None
+        if series_future is not None:
+            for tk, series in series_future.result().items():
+                _memo_put(_SERIES_MEMO, (tk, period, snapshot_date), series)
+                series_cache[tk] = series
+        if funds_future is not None:
+            for tk, funds in funds_future.result().items():
+                _memo_put(_FUNDS_MEMO, (tk, snapshot_date), funds)
+                fund_cache[tk] = funds
+
+    # 입력 티커 순서 유지 (compute_snapshots의 스냅샷 순서)
+    series_cache = {tk: series_cache[tk] for tk in tickers}
+    fund_cache = {tk: fund_cache[tk] for tk in tickers}
 
     return {
         "_series": series_cache,
@@ -41,6 +139,7 @@ def compute_snapshots(state: AgentState) -> Dict[str, Any]:
     """
     시계열로 기간 수익률/변동성 계산하는 노드
     fundamentals 함께 포함해 multiples 필드 구성
+    (_stock_snapshots_soa: 동일 데이터의 컬럼 배열 뷰)
     LangChain Runnable로 래핑되어 LangSmith에 트레이싱됩니다.
     """
     print(f"[Stock_Analyzer] compute_snapshots")
@@ -49,7 +148,7 @@ def compute_snapshots(state: AgentState) -> Dict[str, Any]:
     base_ccy = state.get("financials", {}).get("base_currency", "USD")
 
     for tk, series in (state.get("_series") or {}).items():
-        pct_return, vol = compute_return_and_vol(series)
+        pct_return, vol = _cached_return_and_vol(series)
         funds = (state.get("_funds") or {}).get(tk, {})
         per = funds.get("per")
         eps = funds.get("eps_ttm")
@@ -62,7 +161,8 @@ def compute_snapshots(state: AgentState) -> Dict[str, Any]:
             "events": ["earnings_in_2w"],  # TODO: services.finance에 이벤트 소스 붙이면 교체
         })
 
-    return {"stock_snapshots": snapshots}
+    # 차트/수치 분석용 SoA(struct-of-arrays) 뷰 - 기존 리스트와 함께 제공
+    return {"stock_snapshots": snapshots, "_stock_snapshots_soa": snapshots_to_soa(snapshots)}
 
 
 @chain
@@ -80,7 +180,7 @@ def validate_financial_consistency(state: AgentState) -> Dict[str, Any]:
         series = (state.get("_series") or {}).get(tk)
         if not series:
             continue
-        calc_ret, _ = compute_return_and_vol(series)
+        calc_ret, _ = _cached_return_and_vol(series)
         if abs(round(calc_ret, 2) - s["period_return_pct"]) > 0.1:
             ok = False
 
@@ -4,7 +4,7 @@ Supervisor Agent
 LangGraph 노드 및 조건부 라우팅 함수들로 구성
 LangChain Runnable 기반으로 LangSmith 트레이싱 지원
 """
-from typing import Dict, Any, Literal
+from typing import Dict, Any, List, Literal
 from state import AgentState
 from langchain_core.runnables import chain
 
@@ -41,18 +41,17 @@ def merge_artifacts(state: AgentState) -> Dict[str, Any]:
     cds = state.get("company_dossiers", [])
     ss = state.get("stock_snapshots", [])
 
-    draft = [
-        "# SUMMARY\n",
-        mb.get("summary", "(요약 준비중)"),
-        "\n\n# 시장 개요\n",
-        "\n".join(mb.get("top_trends", [])),
-        "\n\n# 기업 하이라이트\n",
-        "\n".join([c.get("name", "?") + ": " + "; ".join(c.get("business_highlights", [])) for c in cds]),
-        "\n\n# 주식/재무 스냅샷\n",
-        "\n".join([f"{s['ticker']}: return={s['period_return_pct']}%, vol={s['volatility']}" for s in ss]),
+    # 단일 버퍼에 순서대로 기록 후 한 번만 결합 (구분자는 기존 "\n".join(draft) 출력과 동일)
+    buf: List[str] = [
+        "# SUMMARY\n\n", mb.get("summary", "(요약 준비중)"),
+        "\n\n\n# 시장 개요\n\n", "\n".join(mb.get("top_trends", [])),
+        "\n\n\n# 기업 하이라이트\n\n",
+        "\n".join(f"{c.get('name', '?')}: {'; '.join(c.get('business_highlights', []))}" for c in cds),
+        "\n\n\n# 주식/재무 스냅샷\n\n",
+        "\n".join(f"{s['ticker']}: return={s['period_return_pct']}%, vol={s['volatility']}" for s in ss),
     ]
 
-    return {"draft_report_md": "\n".join(draft)}
+    return {"draft_report_md": "".join(buf)}
 
 
 @chain
@@ -81,7 +80,5 @@ def should_continue(state: AgentState) -> Literal["continue", "end"]:
     """
     워크플로우 계속 여부를 결정하는 조건부 엣지 함수
     """
-    # 간단한 조건: report_path가 있으면 종료
-    if state.get("report_path"):
-        return "end"
-    return "continue"
+    # 간단한 조건: report_path를 기록한 노드(export_pdf)가 _done 플래그를 함께 설정
+    return "end" if state.get("_done") else "continue"
@@ -5,7 +5,6 @@ LangGraph 기반 Multi-Agent 워크플로우 실행
 """
 from pathlib import Path
 import uuid
-import json
 import sys
 import yaml
 from datetime import datetime
@@ -51,6 +50,13 @@ except Exception as e:
     print(f"[Main] WARNING: Failed to load .env file: {e}")
 
 from workflow import compile_workflow
+from services.jsonutil import dumps_bytes
+
+# LibYAML C 바인딩이 있으면 사용 (safe_load와 동일 의미, 파싱 속도 향상)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 
 def main(cfg_path: str = "config.yaml"):
@@ -63,12 +69,11 @@ def main(cfg_path: str = "config.yaml"):
     """
     # 설정 파일 로드
     with open(cfg_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=_YamlLoader)
 
     # 출력 디렉토리 생성
-    Path("outputs").mkdir(exist_ok=True)
-    Path("outputs/charts").mkdir(parents=True, exist_ok=True)
-    Path("outputs/reports").mkdir(parents=True, exist_ok=True)
+    for d in ("outputs/charts", "outputs/reports"):
+        Path(d).mkdir(parents=True, exist_ok=True)
 
     # 초기 State 구성
     initial_state = {
@@ -118,6 +123,8 @@ def main(cfg_path: str = "config.yaml"):
         "_company_index": None,
         "_series": {},
         "_funds": {},
+        "_stock_snapshots_soa": {},
+        "_done": False,
         # QA 관련 개별 필드
         "_qa_citation_coverage": 0.0,
         "_qa_number_consistency": True,
@@ -128,8 +135,7 @@ def main(cfg_path: str = "config.yaml"):
     print(f"[Main] Period: {initial_state['period']}, Regions: {initial_state['regions']}")
     print(f"[Main] Benchmarks: {initial_state['benchmarks']}")
 
-    # LangGraph 워크플로우 컴파일
-    print("[Main] Compiling LangGraph workflow...")
+    # LangGraph 워크플로우 (compile_workflow가 컴파일 결과를 캐시하므로 재실행 시 재사용)
     app = compile_workflow()
 
     # 워크플로우 실행
@@ -139,9 +145,10 @@ def main(cfg_path: str = "config.yaml"):
     # 결과 저장
     print("[Main] Saving results...")
     evidence_path = Path("outputs/evidence.jsonl")
-    with open(evidence_path, "w", encoding="utf-8") as f:
-        for ev in final_state.get("evidence_map", []):
-            f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+    # 전체 JSONL을 하나의 bytes 버퍼로 조립 후 1회 기록 (orjson 사용 가능 시 C 구현으로 직렬화)
+    evidence = final_state.get("evidence_map", [])
+    payload = b"".join(dumps_bytes(ev) + b"\n" for ev in evidence)
+    evidence_path.write_bytes(payload)
 
     # 결과 출력
     print(f"\n{'='*60}")
@@ -4,27 +4,183 @@ Report_Compiler Agent
 LangGraph 노드 함수들로 구성
 LangChain Runnable 기반으로 LangSmith 트레이싱 지원
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterator, Tuple, Optional
 from pathlib import Path
+from html import escape, unescape
+from functools import lru_cache
+from itertools import islice
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+import re
+import os
+import shutil
+import hashlib
+import importlib
+import importlib.util
+import io
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성: 없으면 리스트 순회로 고변동 종목 필터
+    np = None
+
 from state import AgentState
 from langchain_core.runnables import chain
+from services.jsonutil import dumps_bytes, loads
 
 
 def _log(msg: str):
     print(f"[ReportCompiler] {msg}")
 
 
-def _generate_appendix_content(state: AgentState) -> str:
-    """Appendix 섹션 상세 내용 생성"""
-    from datetime import datetime
+# ReportLab 폴백용 HTML 태그 스트립 패턴 (selectolax/lxml 미설치 시, <style>/<script> 블록은 내용까지 통째로 제거)
+_TAG_RE = re.compile(r"<(style|script)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+_WKHTML_CANDIDATES = [
+    r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe",  # Windows 기본
+    r"C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe",
+    "/usr/bin/wkhtmltopdf",
+    "/usr/local/bin/wkhtmltopdf",
+]
+
+
+@lru_cache(maxsize=1)
+def _find_wkhtmltopdf() -> Optional[str]:
+    """wkhtmltopdf 바이너리 경로 탐색 (PATH 1회 검색 → 기본 설치 경로 후보, 프로세스당 1회)"""
+    found = shutil.which("wkhtmltopdf")
+    if found:
+        return found
+    for cand in _WKHTML_CANDIDATES:
+        if Path(cand).exists():
+            return cand
+    return None
+
+
+@lru_cache(maxsize=1)
+def _wkhtml_config():
+    """
+    pdfkit Configuration 생성 (프로세스당 1회)
+    바이너리를 찾지 못하면 None (pdfkit 기본 탐색에 맡김)
+    """
+    import pdfkit
+    cand = _find_wkhtmltopdf()
+    if cand:
+        _log(f"wkhtmltopdf found: {cand}")
+        return pdfkit.configuration(wkhtmltopdf=cand)
+    return None
+
+
+# 한글 폰트 파일 경로 (HTML @font-face 및 ReportLab 폴백 공용)
+_FONT_REGULAR_PATH = "assets/fonts/NotoSansKR-Regular.ttf"
+_FONT_BOLD_PATH = "assets/fonts/NotoSansKR-Bold.ttf"
+
+
+@lru_cache(maxsize=1)
+def _font_uris() -> Tuple[str, str]:
+    """
+    로컬 폰트 파일 → file:// URI (wkhtmltopdf가 접근 가능해야 함)
+    프로세스당 1회만 경로 확인/resolve 수행, (regular, bold) 반환
+    """
+    font_regular_path = Path(_FONT_REGULAR_PATH)
+    font_bold_path = Path(_FONT_BOLD_PATH)
+
+    font_regular_uri = font_regular_path.resolve().as_uri() if font_regular_path.exists() else ""
+    font_bold_uri = font_bold_path.resolve().as_uri() if font_bold_path.exists() else font_regular_uri
+
+    if not font_regular_uri:
+        _log("WARN: assets/fonts/NotoSansKR-Regular.ttf not found. PDF 엔진에 따라 한글이 깨질 수 있습니다.")
+    return font_regular_uri, font_bold_uri
+
+
+# LLM 섹션 콘텐츠 캐시 디렉토리 ((섹션, 컨텍스트, 프롬프트·모델 설정) 해시 → JSON)
+COMPOSE_CACHE_DIR = Path("outputs/.compose_cache")
+# 디스크 캐시 항목 수 상한 (초과 시 가장 오래전에 쓰거나 적중한 파일부터 삭제)
+_COMPOSE_CACHE_MAX_ENTRIES = 256
+
+# 프로세스 내 섹션 캐시 (같은 프로세스에서 반복 실행 시 디스크 읽기도 생략)
+_SECTION_MEMO: Dict[str, str] = {}
+
+# LLM 미설정/오류 시 services.llm이 돌려주는 대체 문구 표식 (캐시하지 않음)
+_UNCACHEABLE_MARKERS = ("<p>오류:", "LLM이 설정되지 않아", "콘텐츠 생성 중 오류", "프롬프트가 정의되지 않았습니다")
+
+
+def _section_cache_key(section_name: str, context_digest: bytes, prompt_digest: bytes) -> str:
+    return hashlib.blake2b(
+        section_name.encode("utf-8") + b"\0" + context_digest + prompt_digest, digest_size=16
+    ).hexdigest()
+
+
+def _prune_compose_cache() -> None:
+    """디스크 캐시를 _COMPOSE_CACHE_MAX_ENTRIES개로 유지 (mtime 오래된 순으로 삭제)"""
+    try:
+        entries = [(e.stat().st_mtime, e.path) for e in os.scandir(COMPOSE_CACHE_DIR)
+                   if e.name.endswith(".json") and e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= _COMPOSE_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - _COMPOSE_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            _log(f"WARN: Failed to prune section cache {path}: {e}")
+
+
+def _generate_sections_cached(section_names: List[str], context: Dict[str, Any]) -> Dict[str, str]:
+    """
+    LLM 섹션 콘텐츠 생성 ((섹션, 컨텍스트, 프롬프트·모델 설정) 내용 해시 기반 캐시)
+    - 컨텍스트를 blake2b로 한 번 해시하고, 섹션별 키로 메모리 → outputs/.compose_cache/<hash>.json 순서로 조회
+    - 캐시에 없는 섹션만 모아 한 번에 생성 (입력·프롬프트·모델이 바뀌면 키가 달라져 자동 무효화)
+    - LLM 미설정/오류 응답은 캐시하지 않음, 디스크 캐시는 _COMPOSE_CACHE_MAX_ENTRIES개로 제한
+    """
+    from services.llm import generate_sections_batch, section_prompt_fingerprint
 
-    snapshot_date = state.get("snapshot_date", datetime.now().strftime("%Y-%m-%d"))
+    context_digest = hashlib.blake2b(dumps_bytes(context, sort_keys=True), digest_size=16).digest()
+    prompt_digest = section_prompt_fingerprint()
+    keys = {name: _section_cache_key(name, context_digest, prompt_digest) for name in section_names}
+
+    sections: Dict[str, str] = {}
+    for name, key in keys.items():
+        if key in _SECTION_MEMO:
+            sections[name] = _SECTION_MEMO[key]
+            continue
+        cache_file = COMPOSE_CACHE_DIR / f"{key}.json"
+        if cache_file.exists():
+            try:
+                sections[name] = _SECTION_MEMO[key] = loads(cache_file.read_bytes())
+                os.utime(cache_file)  # 적중 항목은 정리 대상에서 뒤로
+            except Exception as e:
+                _log(f"WARN: Failed to read section cache ({e}), regenerating {name}")
+
+    missing = [name for name in section_names if name not in sections]
+    if len(missing) < len(section_names):
+        _log(f"Section cache hit: {[n for n in section_names if n in sections]}")
+    if not missing:
+        return sections
+
+    generated = generate_sections_batch(missing, context)
+    sections.update(generated)
+
+    written = False
+    for name, html in generated.items():
+        if any(marker in html for marker in _UNCACHEABLE_MARKERS):
+            continue
+        key = keys[name]
+        _SECTION_MEMO[key] = html
+        try:
+            COMPOSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (COMPOSE_CACHE_DIR / f"{key}.json").write_bytes(dumps_bytes(html))
+            written = True
+        except Exception as e:
+            _log(f"WARN: Failed to write section cache: {e}")
+    if written:
+        _prune_compose_cache()
+    return sections
 
-    company_count = len(state.get('company_dossiers', []))
-    stock_count = len(state.get('stock_snapshots', []))
-    reference_count = len(state.get('evidence_map', []))
 
-    appendix_html = f"""
+# Appendix (정적 HTML 골격, 실행별 값만 format_map으로 채움)
+_APPENDIX_TMPL = """
     <div class="appendix-section">
         <h3>데이터 개요</h3>
         <ul>
@@ -56,60 +212,146 @@ def _generate_appendix_content(state: AgentState) -> str:
     </div>
     """
 
-    return appendix_html
 
+def _generate_appendix_content(state: AgentState) -> str:
+    """Appendix 섹션 상세 내용 생성"""
+    from datetime import datetime
 
-@chain
-def assemble_outline(state: AgentState) -> Dict[str, Any]:
-    """아웃라인 결정을 위한 사전 단계 노드"""
-    print(f"[ReportCompiler] assemble_outline")
+    get = state.get
+    return _APPENDIX_TMPL.format_map({
+        "snapshot_date": get("snapshot_date", datetime.now().strftime("%Y-%m-%d")),
+        "company_count": len(get('company_dossiers') or []),
+        "stock_count": len(get('stock_snapshots') or []),
+        "reference_count": len(get('evidence_map') or []),
+    })
 
-    outline = state["output"].get("sections", [])
 
-    return {"_outline": outline}
+# 차트 HTML 조각 포매터 (모듈 로드 시 1회 생성한 템플릿 재사용)
+_CHART_IMG = '<div class="chart-container"><img src="{}" alt="{}" class="chart-image"/></div>'.format
+_CHART_MISSING = '<p class="chart-error">차트를 찾을 수 없습니다: {}</p>'.format
 
 
-@chain
-def compose_sections(state: AgentState) -> Dict[str, Any]:
+def _iter_chart_html(charts: List[Tuple[Dict[str, Any], str]], *, report_missing: bool = False) -> Iterator[str]:
     """
-    HTML 문서 생성 노드 (UTF-8, 한글 폰트 임베딩)
-    LangChain Runnable로 래핑되어 LangSmith에 트레이싱됩니다.
+    섹션 차트 이미지 HTML 조각 생성 (파일이 없으면 report_missing일 때만 오류 표시)
+    charts: (chart, file:// URI 또는 파일이 없으면 "") 목록
     """
-    print(f"[ReportCompiler] compose_sections")
+    for chart, chart_uri in charts:
+        if chart_uri:
+            yield _CHART_IMG(chart_uri, escape(chart["alt"]))
+        elif report_missing:
+            yield _CHART_MISSING(escape(chart["path"]))
+
+
+# 목록 행 포매터 (행마다 f-string을 새로 평가하지 않도록 bound format 재사용)
+_SS_ROW = "<li>{}: return {}%, vol {}</li>".format
+_REF_ROW = "<li>{} ({}) - {}</li>".format
+_LINK = '<a href="{}">{}</a>'.format
+
+
+# 전략/투자 시사점 행 템플릿 (인자는 호출 측에서 이스케이프)
+_IMPL_MARKET = "<li><strong>[시장 분석]</strong> {}... 에 대한 대응 전략 수립 필요</li>"
+_IMPL_RISK = "<li><strong>[{} 리스크]</strong> {}...</li>"
+_IMPL_VOLATILITY = "<li><strong>[변동성 모니터링]</strong> {} 등 고변동성 종목에 대한 리스크 관리 강화</li>"
+# 페르소나별 기본 시사점 (정의되지 않은 페르소나는 corporate_strategy 사용)
+_IMPL_PERSONA = {
+    "retail_investor": (
+        "<li><strong>[단기 전략]</strong> 실적 발표 시즌 변동성 대응 전략 수립</li>",
+        "<li><strong>[장기 전략]</strong> EV 공급망 관련 테마주 포트폴리오 구성 검토</li>",
+    ),
+    "corporate_strategy": (
+        "<li><strong>[전략적 과제]</strong> 배터리 공급망 다변화 및 현지화 추진</li>",
+        "<li><strong>[운영 효율화]</strong> 가격 경쟁력 확보를 위한 원가 절감 이니셔티브</li>",
+    ),
+}
+
+
+def _iter_ref_html(refs: List[Dict[str, Any]]) -> Iterator[str]:
+    """참고문헌 항목 HTML 생성 (제목/날짜 이스케이프, URL은 링크로 출력)"""
+    g = dict.get
+    for e in refs:
+        url = str(g(e, 'url') or '')
+        link = _LINK(escape(url, quote=True), escape(url)) if url else ''
+        yield _REF_ROW(escape(str(g(e, 'title') or '')), escape(str(g(e, 'date') or '')), link)
+
+
+def _iter_body(
+    state: AgentState,
+    mb: Dict[str, Any],
+    cds: List[Dict[str, Any]],
+    ss: List[Dict[str, Any]],
+    trends: List[str],
+    implications: List[Tuple[str, Tuple[str, ...]]],
+    refs: List[Dict[str, Any]],
+    sections: Dict[str, str],
+    chart_by_section: Dict[str, List[Tuple[Dict[str, Any], str]]],
+) -> Iterator[str]:
+    """본문 HTML 조각을 순서대로 생성 (텍스트 값은 생성과 동시에 이스케이프)"""
+    yield f'<h1 id="section-summary">1. SUMMARY</h1><p>{escape(mb.get("summary", "LLM 요약 생성 중..."))}</p>'
+
+    yield '<h2 id="section-market-overview">2. 시장 개요 & 핵심 트렌드</h2><ul>' + "".join(f"<li>{escape(t)}</li>" for t in trends) + "</ul>"
 
-    mb = state.get("market_brief", {}) or {}
-    cds = state.get("company_dossiers", []) or []
-    ss = state.get("stock_snapshots", []) or []
+    # 시장 트렌드 차트 추가
+    yield from _iter_chart_html(chart_by_section.get("market", []), report_missing=True)
 
-    # 로컬 폰트 파일 → file:// URI (wkhtmltopdf가 접근 가능해야 함)
-    font_regular_path = Path("assets/fonts/NotoSansKR-Regular.ttf")
-    font_bold_path = Path("assets/fonts/NotoSansKR-Bold.ttf")
+    yield '<h2 id="section-demand-pricing">3. 수요 & 가격 전략(마진 압력)</h2>'
+    yield sections["demand_pricing"]
 
-    font_regular_uri = font_regular_path.resolve().as_uri() if font_regular_path.exists() else ""
-    font_bold_uri = font_bold_path.resolve().as_uri() if font_bold_path.exists() else font_regular_uri
+    yield '<h2 id="section-policy">4. 정책·규제 Watch</h2>'
+    yield sections["policy"]
 
-    if not font_regular_uri:
-        _log("WARN: assets/fonts/NotoSansKR-Regular.ttf not found. PDF 엔진에 따라 한글이 깨질 수 있습니다.")
+    yield '<h2 id="section-battery">5. 배터리 기술 & 공급망 코어</h2>'
+    yield sections["battery_supply"]
+
+    # 경쟁 구도 섹션 - 기업 정보가 있으면 표시
+    yield '<h2 id="section-competition">6. 경쟁 구도 & 지역 하이라이트</h2>'
 
-    # LLM을 사용하여 섹션 콘텐츠 생성
-    from services.llm import generate_section_content
+    # 기업 하이라이트 차트 추가
+    yield from _iter_chart_html(chart_by_section.get("company", []))
 
-    # 컨텍스트 구성
-    context = {
-        "market_brief": mb,
-        "company_dossiers": cds,
-        "stock_snapshots": ss,
-        "segments": state.get("segments", []),
-        "regions": state.get("regions", []),
-        "period": state.get("period", ""),
-    }
+    if cds:
+        yield "<h3>주요 기업 하이라이트</h3><ul>"
+        for c in cds:
+            ticker = escape(c.get('ticker', 'N/A'))
+            highlights = c.get('business_highlights', [])
+            if highlights:
+                yield f"<li><strong>{ticker}</strong>: {escape('; '.join(highlights[:3]))}</li>"
+            else:
+                yield f"<li><strong>{ticker}</strong>: 정보 수집 중</li>"
+        yield "</ul>"
+    else:
+        yield "<p>기업 데이터가 수집되지 않았습니다.</p>"
 
-    # 표지 페이지 - 개선된 디자인
-    from datetime import datetime
-    report_number = f"EV-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-    snapshot_date = state.get('snapshot_date', datetime.now().strftime('%Y-%m-%d'))
+    # 전략/투자 시사점 섹션
+    yield '<h2 id="section-implications">7. 전략/투자 시사점</h2>'
+    if implications:
+        yield "<ul>" + "\n".join(tmpl.format(*args) for tmpl, args in implications) + "</ul>"
+    else:
+        yield "<p>시사점 생성을 위한 데이터가 부족합니다.</p>"
+
+    # 주가/재무 스냅샷 섹션
+    yield '<h2 id="section-stock">8. 주가/재무 스냅샷</h2>'
+
+    # 주가 수익률 차트 추가
+    yield from _iter_chart_html(chart_by_section.get("stock", []))
 
-    cover_page = f"""
+    if ss:
+        g = dict.get
+        yield "<ul>" + "".join(
+            _SS_ROW(escape(str(g(s, 'ticker', ''))), g(s, 'period_return_pct'), g(s, 'volatility')) for s in ss
+        ) + "</ul>"
+    else:
+        yield "<p>데이터 준비중</p>"
+
+    yield '<h2 id="section-reference">9. REFERENCE</h2><ol>' + "".join(_iter_ref_html(refs)) + "</ol>"
+
+    # Appendix 섹션 - 상세 내용 생성
+    yield '<h2 id="section-appendix">10. APPENDIX</h2>'
+    yield _generate_appendix_content(state)
+
+
+# 표지 (정적 HTML 골격, 실행별 값만 format_map으로 채움)
+_COVER_TMPL = """
     <div class="cover-page">
         <div class="cover-header">
             <div class="cover-logo">
@@ -141,15 +383,15 @@ def compose_sections(state: AgentState) -> Dict[str, Any]:
                 </tr>
                 <tr>
                     <td class="info-label">분석 기간</td>
-                    <td class="info-value">{state.get('period', 'N/A')}</td>
+                    <td class="info-value">{period}</td>
                 </tr>
                 <tr>
                     <td class="info-label">분석 대상 지역</td>
-                    <td class="info-value">{', '.join(state.get('regions', ['Global']))}</td>
+                    <td class="info-value">{regions}</td>
                 </tr>
                 <tr>
                     <td class="info-label">분석 세그먼트</td>
-                    <td class="info-value">{', '.join(state.get('segments', ['All Segments']))}</td>
+                    <td class="info-value">{segments}</td>
                 </tr>
                 <tr>
                     <td class="info-label">분석 시스템</td>
@@ -170,8 +412,8 @@ def compose_sections(state: AgentState) -> Dict[str, Any]:
     <div class="page-break"></div>
     """
 
-    # 목차 생성
-    toc = """
+# 목차 (정적 HTML)
+_TOC_HTML = """
     <div class="toc-page">
         <h1>목차 (Table of Contents)</h1>
         <ul class="toc-list">
@@ -190,162 +432,25 @@ def compose_sections(state: AgentState) -> Dict[str, Any]:
     <div class="page-break"></div>
     """
 
-    # 차트 데이터 가져오기 및 중복 제거
-    charts = state.get("charts", [])
-    chart_by_section = {}
-    seen_chart_paths = set()  # 중복 이미지 방지용
-
-    for chart in charts:
-        chart_path = chart.get("path", "")
-        # 중복된 경로는 스킵
-        if chart_path in seen_chart_paths:
-            print(f"[ReportCompiler] Skipping duplicate chart: {chart_path}")
-            continue
-
-        seen_chart_paths.add(chart_path)
-        section = chart.get("section", "unknown")
-        if section not in chart_by_section:
-            chart_by_section[section] = []
-        chart_by_section[section].append(chart)
-
-    # 섹션 조립
-    body_parts = []
-    body_parts.append(f'<h1 id="section-summary">1. SUMMARY</h1><p>{mb.get("summary","LLM 요약 생성 중...")}</p>')
-
-    trends = mb.get("top_trends", []) or ["트렌드 정보 없음"]
-    body_parts.append('<h2 id="section-market-overview">2. 시장 개요 & 핵심 트렌드</h2><ul>' + "".join([f"<li>{t}</li>" for t in trends]) + "</ul>")
-
-    # 시장 트렌드 차트 추가
-    if "market" in chart_by_section:
-        for chart in chart_by_section["market"]:
-            chart_path = Path(chart["path"])
-            if chart_path.exists():
-                chart_uri = chart_path.resolve().as_uri()
-                body_parts.append(f'<div class="chart-container"><img src="{chart_uri}" alt="{chart["alt"]}" class="chart-image"/></div>')
-            else:
-                body_parts.append(f'<p class="chart-error">차트를 찾을 수 없습니다: {chart["path"]}</p>')
-
-    # LLM으로 각 섹션 콘텐츠 생성
-    body_parts.append('<h2 id="section-demand-pricing">3. 수요 & 가격 전략(마진 압력)</h2>')
-    demand_content = generate_section_content("demand_pricing", context)
-    body_parts.append(demand_content)
-
-    body_parts.append('<h2 id="section-policy">4. 정책·규제 Watch</h2>')
-    policy_content = generate_section_content("policy", context)
-    body_parts.append(policy_content)
-
-    body_parts.append('<h2 id="section-battery">5. 배터리 기술 & 공급망 코어</h2>')
-    battery_content = generate_section_content("battery_supply", context)
-    body_parts.append(battery_content)
-
-    # 경쟁 구도 섹션 - 기업 정보가 있으면 표시
-    body_parts.append('<h2 id="section-competition">6. 경쟁 구도 & 지역 하이라이트</h2>')
-
-    # 기업 하이라이트 차트 추가
-    if "company" in chart_by_section:
-        for chart in chart_by_section["company"]:
-            chart_path = Path(chart["path"])
-            if chart_path.exists():
-                chart_uri = chart_path.resolve().as_uri()
-                body_parts.append(f'<div class="chart-container"><img src="{chart_uri}" alt="{chart["alt"]}" class="chart-image"/></div>')
-
-    if cds:
-        body_parts.append("<h3>주요 기업 하이라이트</h3><ul>")
-        for c in cds:
-            ticker = c.get('ticker', 'N/A')
-            highlights = c.get('business_highlights', [])
-            if highlights and len(highlights) > 0:
-                body_parts.append(f"<li><strong>{ticker}</strong>: {'; '.join(highlights[:3])}</li>")
-            else:
-                body_parts.append(f"<li><strong>{ticker}</strong>: 정보 수집 중</li>")
-        body_parts.append("</ul>")
-    else:
-        body_parts.append("<p>기업 데이터가 수집되지 않았습니다.</p>")
-
-    # 전략/투자 시사점 섹션
-    body_parts.append('<h2 id="section-implications">7. 전략/투자 시사점</h2>')
-    persona = state.get("persona", "corporate_strategy")
-
-    # 실제 데이터 기반 시사점 생성
-    implications = []
-
-    # 시장 트렌드 기반 시사점
-    if trends and len(trends) > 0:
-        implications.append(f"<li><strong>[시장 분석]</strong> {trends[0][:100]}... 에 대한 대응 전략 수립 필요</li>")
-
-    # 기업 리스크 기반 시사점
-    if cds:
-        for c in cds[:2]:  # 상위 2개 기업만
-            risks = c.get('risk_factors', [])
-            if risks and len(risks) > 0:
-                implications.append(f"<li><strong>[{c['ticker']} 리스크]</strong> {risks[0][:100]}...</li>")
-
-    # 주가 변동성 기반 시사점
-    if ss:
-        high_vol_stocks = [s for s in ss if s.get('volatility', 0) > 2.0]
-        if high_vol_stocks:
-            tickers = ', '.join([s['ticker'] for s in high_vol_stocks[:3]])
-            implications.append(f"<li><strong>[변동성 모니터링]</strong> {tickers} 등 고변동성 종목에 대한 리스크 관리 강화</li>")
-
-    # 페르소나별 기본 시사점 추가
-    if persona == "retail_investor":
-        implications.append("<li><strong>[단기 전략]</strong> 실적 발표 시즌 변동성 대응 전략 수립</li>")
-        implications.append("<li><strong>[장기 전략]</strong> EV 공급망 관련 테마주 포트폴리오 구성 검토</li>")
-    else:
-        implications.append("<li><strong>[전략적 과제]</strong> 배터리 공급망 다변화 및 현지화 추진</li>")
-        implications.append("<li><strong>[운영 효율화]</strong> 가격 경쟁력 확보를 위한 원가 절감 이니셔티브</li>")
-
-    if implications:
-        body_parts.append("<ul>" + "\n".join(implications) + "</ul>")
-    else:
-        body_parts.append("<p>시사점 생성을 위한 데이터가 부족합니다.</p>")
-
-    # 주가/재무 스냅샷 섹션
-    body_parts.append('<h2 id="section-stock">8. 주가/재무 스냅샷</h2>')
-
-    # 주가 수익률 차트 추가
-    if "stock" in chart_by_section:
-        for chart in chart_by_section["stock"]:
-            chart_path = Path(chart["path"])
-            if chart_path.exists():
-                chart_uri = chart_path.resolve().as_uri()
-                body_parts.append(f'<div class="chart-container"><img src="{chart_uri}" alt="{chart["alt"]}" class="chart-image"/></div>')
-
-    if ss:
-        body_parts.append("<ul>" + "".join([f"<li>{s['ticker']}: return {s['period_return_pct']}%, vol {s['volatility']}</li>" for s in ss]) + "</ul>")
-    else:
-        body_parts.append("<p>데이터 준비중</p>")
-
-    refs = state.get('evidence_map', []) or []
-    body_parts.append('<h2 id="section-reference">9. REFERENCE</h2><ol>' +
-                      "".join([f"<li>{e.get('title')} ({e.get('date')}) - {e.get('url')}</li>" for e in refs]) +
-                      "</ol>")
-
-    # Appendix 섹션 - 상세 내용 생성
-    body_parts.append('<h2 id="section-appendix">10. APPENDIX</h2>')
-    body_parts.append(_generate_appendix_content(state))
-
-    body_html = "\n".join(body_parts)
-
-    # 완전한 HTML 문서(UTF-8 + 폰트 임베딩 + 기본 스타일)
-    html = f"""<!doctype html>
+# 문서 head + 정적 CSS (폰트 관련 부분만 치환)
+_HEAD_TMPL = Template("""<!doctype html>
 <html lang="ko">
 <head>
 <meta charset="utf-8">
 <title>EV Trend Report</title>
 <style>
   /* 한글 폰트 임베딩 (wkhtmltopdf가 file:// 접근 가능해야 함) */
-  {'@font-face { font-family: "NotoSansKR"; src: url("' + font_regular_uri + '") format("truetype"); font-weight: 400; font-style: normal; }' if font_regular_uri else ''}
-  {'@font-face { font-family: "NotoSansKR"; src: url("' + font_bold_uri + '") format("truetype"); font-weight: 700; font-style: normal; }' if font_bold_uri else ''}
+  $font_face_regular
+  $font_face_bold
 
-  html, body {{
-    font-family: {"'NotoSansKR'," if font_regular_uri else ""} 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif;
+  html, body {
+    font-family: $font_family_prefix 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif;
     font-weight: 400; font-size: 12px; line-height: 1.55;
     color: #111; margin: 0; padding: 0;
-  }}
+  }
 
   /* 표지 스타일 - 개선된 디자인 */
-  .cover-page {{
+  .cover-page {
     min-height: 100vh;
     display: flex;
     flex-direction: column;
@@ -353,302 +458,567 @@ def compose_sections(state: AgentState) -> Dict[str, Any]:
     padding: 48px 64px;
     background: linear-gradient(135deg, #f5f7fa 0%, #e8f0ff 50%, #cdd8ff 100%);
     color: #1b263b;
-  }}
+  }
 
-  .cover-header {{
+  .cover-header {
     text-align: left;
-  }}
+  }
 
-  .cover-logo {{
+  .cover-logo {
     display: flex;
     align-items: center;
     gap: 12px;
-  }}
+  }
 
-  .logo-icon {{
+  .logo-icon {
     font-size: 36px;
     background: #1b263b;
     color: #ffffff;
     padding: 8px 16px;
     border-radius: 8px;
-  }}
+  }
 
-  .logo-text {{
+  .logo-text {
     font-size: 18px;
     font-weight: 600;
     letter-spacing: 0.5px;
     color: #1b263b;
-  }}
+  }
 
-  .cover-main {{
+  .cover-main {
     text-align: center;
     margin: 40px 0;
-  }}
+  }
 
-  .cover-title h1 {{
+  .cover-title h1 {
     font-size: 46px;
     font-weight: 700;
     margin: 0 0 20px;
     letter-spacing: -0.5px;
     color: #1b263b;
-  }}
+  }
 
-  .cover-title h2 {{
+  .cover-title h2 {
     font-size: 30px;
     font-weight: 500;
     margin: 0 0 28px;
     color: #334155;
-  }}
+  }
 
-  .cover-subtitle {{
+  .cover-subtitle {
     margin-top: 20px;
-  }}
+  }
 
-  .cover-subtitle p {{
+  .cover-subtitle p {
     font-size: 16px;
     font-weight: 400;
     letter-spacing: 0.8px;
     color: #52606d;
-  }}
+  }
 
-  .cover-info-box {{
+  .cover-info-box {
     background: #ffffff;
     border-radius: 16px;
     padding: 36px 40px;
     border: 1px solid #d0d7e2;
     box-shadow: 0 12px 24px rgba(27, 38, 59, 0.08);
-  }}
+  }
 
-  .cover-info-table {{
+  .cover-info-table {
     width: 100%;
     border-collapse: collapse;
-  }}
+  }
 
-  .cover-info-table tr {{
+  .cover-info-table tr {
     border-bottom: 1px solid #e2e8f0;
-  }}
+  }
 
-  .cover-info-table tr:last-child {{
+  .cover-info-table tr:last-child {
     border-bottom: none;
-  }}
+  }
 
-  .cover-info-table td {{
+  .cover-info-table td {
     padding: 14px 20px;
     text-align: left;
-  }}
+  }
 
-  .info-label {{
+  .info-label {
     font-weight: 600;
     font-size: 13px;
     color: #475569;
     width: 35%;
-  }}
+  }
 
-  .info-value {{
+  .info-value {
     font-weight: 600;
     font-size: 14px;
     color: #1b263b;
-  }}
+  }
 
-  .cover-footer {{
+  .cover-footer {
     text-align: center;
     margin-top: 40px;
     color: #64748b;
     font-size: 12px;
-  }}
+  }
 
-  .cover-disclaimer {{
+  .cover-disclaimer {
     margin: 8px 0;
-  }}
+  }
 
-  .cover-confidential {{
+  .cover-confidential {
     font-weight: 600;
     letter-spacing: 1px;
     color: #475569;
-  }}
+  }
 
   /* 목차 스타일 */
-  .toc-page {{
+  .toc-page {
     min-height: 100vh;
     padding: 60px 40px;
-  }}
+  }
 
-  .toc-page h1 {{
+  .toc-page h1 {
     font-size: 32px;
     font-weight: 700;
     margin: 0 0 40px;
     padding-bottom: 16px;
     border-bottom: 3px solid #667eea;
-  }}
+  }
 
-  .toc-list {{
+  .toc-list {
     list-style: none;
     padding: 0;
     margin: 0;
-  }}
+  }
 
-  .toc-list li {{
+  .toc-list li {
     margin: 18px 0;
     padding: 12px 20px;
     background: #f8f9fa;
     border-radius: 6px;
     transition: background 0.2s;
-  }}
+  }
 
-  .toc-list li:hover {{
+  .toc-list li:hover {
     background: #e9ecef;
-  }}
+  }
 
-  .toc-list a {{
+  .toc-list a {
     font-size: 16px;
     color: #495057;
     text-decoration: none;
     font-weight: 500;
-  }}
+  }
 
-  .toc-list a:hover {{
+  .toc-list a:hover {
     color: #667eea;
-  }}
+  }
 
   /* 페이지 구분 */
-  .page-break {{
+  .page-break {
     page-break-after: always;
-  }}
+  }
 
   /* 본문 스타일 */
-  body > h1, body > h2, body > h3, body > p, body > ul, body > ol {{
+  body > h1, body > h2, body > h3, body > p, body > ul, body > ol {
     padding-left: 40px;
     padding-right: 40px;
-  }}
+  }
 
-  h1 {{
+  h1 {
     font-weight: 700;
     font-size: 26px;
     margin: 40px 0 20px;
     padding-top: 20px;
     border-top: 2px solid #dee2e6;
-  }}
+  }
 
-  h2 {{
+  h2 {
     font-weight: 700;
     font-size: 20px;
     margin: 30px 0 16px;
     color: #495057;
-  }}
+  }
 
-  h3 {{
+  h3 {
     font-weight: 600;
     font-size: 16px;
     margin: 20px 0 12px;
     color: #6c757d;
-  }}
+  }
 
-  ul {{
+  ul {
     margin: 0 0 16px 58px;
     line-height: 1.8;
-  }}
+  }
 
-  ol {{
+  ol {
     margin: 0 0 16px 58px;
     line-height: 1.8;
-  }}
+  }
 
-  p {{
+  p {
     margin: 0 0 12px;
     line-height: 1.7;
-  }}
+  }
 
-  a {{
+  a {
     color: #0a58ca;
     text-decoration: none;
-  }}
+  }
 
-  a:hover {{
+  a:hover {
     text-decoration: underline;
-  }}
+  }
 
-  li {{
+  li {
     margin-bottom: 8px;
-  }}
+  }
 
   /* 차트 스타일 */
-  .chart-container {{
+  .chart-container {
     margin: 24px 40px;
     padding: 20px;
     background: #f8f9fa;
     border-radius: 8px;
     text-align: center;
     box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-  }}
+  }
 
-  .chart-image {{
+  .chart-image {
     max-width: 100%;
     height: auto;
     border-radius: 4px;
     box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-  }}
+  }
 
-  .chart-error {{
+  .chart-error {
     color: #dc3545;
     font-style: italic;
     padding: 20px 40px;
-  }}
+  }
 
   /* Appendix 섹션 스타일 */
-  .appendix-section {{
+  .appendix-section {
     padding: 20px 40px;
-  }}
+  }
 
-  .appendix-section h3 {{
+  .appendix-section h3 {
     font-weight: 700;
     font-size: 18px;
     margin: 30px 0 16px;
     color: #2c3e50;
     padding-bottom: 8px;
     border-bottom: 2px solid #3498db;
-  }}
+  }
 
-  .appendix-section h4 {{
+  .appendix-section h4 {
     font-weight: 600;
     font-size: 15px;
     margin: 24px 0 12px;
     color: #34495e;
-  }}
+  }
 
-  .appendix-section ul {{
+  .appendix-section ul {
     margin: 12px 0 16px 20px;
     line-height: 1.8;
-  }}
+  }
 
-  .appendix-section ol {{
+  .appendix-section ol {
     margin: 12px 0 16px 20px;
     line-height: 1.8;
-  }}
+  }
 
-  .appendix-section li {{
+  .appendix-section li {
     margin-bottom: 10px;
-  }}
+  }
 
-  .appendix-section strong {{
+  .appendix-section strong {
     color: #2c3e50;
     font-weight: 600;
-  }}
+  }
 </style>
 </head>
 <body>
-{cover_page}
-{toc}
-{body_html}
-</body>
-</html>"""
+""")
+
+
+@lru_cache(maxsize=4)
+def _html_head(font_regular_uri: str, font_bold_uri: str) -> str:
+    """폰트 URI를 반영한 <head> ~ <body> 시작 태그까지의 HTML (폰트 조합별 1회 생성)"""
+    def font_face(uri: str, weight: int) -> str:
+        if not uri:
+            return ""
+        return ('@font-face { font-family: "NotoSansKR"; src: url("' + uri +
+                f'") format("truetype"); font-weight: {weight}; font-style: normal; }}')
+
+    return _HEAD_TMPL.substitute(
+        font_face_regular=font_face(font_regular_uri, 400),
+        font_face_bold=font_face(font_bold_uri, 700),
+        font_family_prefix="'NotoSansKR'," if font_regular_uri else "",
+    )
+
+
+@chain
+def assemble_outline(state: AgentState) -> Dict[str, Any]:
+    """아웃라인 결정을 위한 사전 단계 노드"""
+    print(f"[ReportCompiler] assemble_outline")
+
+    outline = state["output"].get("sections", [])
+
+    return {"_outline": outline}
+
+
+def _list_dir(path: str) -> frozenset:
+    """디렉터리의 항목 이름 집합 (없거나 읽을 수 없으면 빈 집합)"""
+    try:
+        with os.scandir(path) as it:
+            return frozenset(e.name for e in it)
+    except OSError:
+        return frozenset()
+
+
+@chain
+def compose_sections(state: AgentState) -> Dict[str, Any]:
+    """
+    HTML 문서 생성 노드 (UTF-8, 한글 폰트 임베딩)
+    LangChain Runnable로 래핑되어 LangSmith에 트레이싱됩니다.
+    """
+    print(f"[ReportCompiler] compose_sections")
+
+    # State 조회는 여기서 한 번만 정규화 (None/빈 값 → 기본값)
+    get = state.get
+    mb = get("market_brief") or {}
+    cds = get("company_dossiers") or []
+    ss = get("stock_snapshots") or []
+
+    font_regular_uri, font_bold_uri = _font_uris()
+
+    # 컨텍스트 구성
+    context = {
+        "market_brief": mb,
+        "company_dossiers": cds,
+        "stock_snapshots": ss,
+        "segments": get("segments", []),
+        "regions": get("regions", []),
+        "period": get("period", ""),
+    }
+
+    # 표지 페이지 - 개선된 디자인
+    from datetime import datetime
+    report_number = f"EV-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    snapshot_date = get('snapshot_date', datetime.now().strftime('%Y-%m-%d'))
+
+    cover_page = _COVER_TMPL.format_map({
+        "report_number": report_number,
+        "snapshot_date": snapshot_date,
+        "period": get('period', 'N/A'),
+        "regions": ', '.join(get('regions', ['Global'])),
+        "segments": ', '.join(get('segments', ['All Segments'])),
+    })
+
+    # 차트 데이터 가져오기 및 중복 제거 (존재 확인은 디렉터리당 scandir 1회, URI 변환은 차트당 1회)
+    charts = get("charts", [])
+    chart_by_section: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+    seen_chart_paths = set()  # 중복 이미지 방지용
+    dir_entries: Dict[str, frozenset] = {}  # 디렉터리별 파일 목록 (os.scandir 1회)
+
+    for chart in charts:
+        chart_path = chart.get("path", "")
+        # 중복된 경로는 스킵
+        if chart_path in seen_chart_paths:
+            print(f"[ReportCompiler] Skipping duplicate chart: {chart_path}")
+            continue
+
+        seen_chart_paths.add(chart_path)
+        p = Path(chart_path)
+        parent = str(p.parent)
+        if parent not in dir_entries:
+            dir_entries[parent] = _list_dir(parent)
+        chart_uri = p.resolve().as_uri() if chart_path and p.name in dir_entries[parent] else ""
+        chart_by_section.setdefault(chart.get("section", "unknown"), []).append((chart, chart_uri))
+
+    # LLM으로 각 섹션 콘텐츠 생성 (공통 컨텍스트를 공유하는 3개 섹션을 한 번의 요청으로 생성, 입력이 같으면 캐시 재사용)
+    sections = _generate_sections_cached(["demand_pricing", "policy", "battery_supply"], context)
+
+    trends = mb.get("top_trends") or ["트렌드 정보 없음"]
+    persona = get("persona", "corporate_strategy")
+
+    # 실제 데이터 기반 시사점 생성 ((템플릿, 인자) 행 목록 → 본문 렌더링 시 한 번에 포맷)
+    implications: List[Tuple[str, Tuple[str, ...]]] = []
+
+    # 시장 트렌드 기반 시사점 (첫 트렌드만 100자로 한 번 잘라 사용)
+    if trends:
+        implications.append((_IMPL_MARKET, (escape(trends[0][:100]),)))
+
+    # 기업 리스크 기반 시사점 (상위 2개 기업만, 리스트 복사 없이 순회)
+    for c in islice(cds, 2):
+        risks = c.get('risk_factors')
+        if risks:
+            implications.append((_IMPL_RISK, (escape(c['ticker']), escape(risks[0][:100]))))
+
+    # 주가 변동성 기반 시사점
+    if ss:
+        # compute_snapshots가 만든 컬럼 배열이 있으면 벡터 비교 마스크로 필터 (없거나 길이가 다르면 리스트 순회)
+        vols = (get("_stock_snapshots_soa") or {}).get("volatility")
+        if np is not None and vols is not None and len(vols) == len(ss):
+            high_vol_tickers = [ss[i]['ticker'] for i in np.flatnonzero(np.asarray(vols) > 2.0)[:3]]
+        else:
+            high_vol_tickers = [s['ticker'] for s in ss if (s.get('volatility') or 0) > 2.0][:3]
+        if high_vol_tickers:
+            implications.append((_IMPL_VOLATILITY, (escape(', '.join(high_vol_tickers)),)))
+
+    # 페르소나별 기본 시사점 추가
+    implications.extend((row, ()) for row in _IMPL_PERSONA.get(persona, _IMPL_PERSONA["corporate_strategy"]))
+
+    refs = get('evidence_map') or []
+
+    # 완전한 HTML 문서(UTF-8 + 폰트 임베딩 + 기본 스타일)
+    # StringIO 버퍼에 순차 기록 (대용량 본문 결합용 중간 문자열 생성 회피)
+    buf = io.StringIO()
+    w = buf.write
+    w(_html_head(font_regular_uri, font_bold_uri))
+    w(cover_page)
+    w("\n")
+    w(_TOC_HTML)
+    w("\n")
+    # 섹션 조립 (제너레이터가 만든 HTML 조각을 중간 결합 없이 바로 버퍼에 기록)
+    for part in _iter_body(state, mb, cds, ss, trends, implications, refs, sections, chart_by_section):
+        w(part)
+        w("\n")
+    w("</body>\n</html>")
+    html = buf.getvalue()
 
     return {"draft_report_md": html}
 
 
+def _render_pdfkit(pdfkit, html: str, pdf_path: Path) -> None:
+    """pdfkit(wkhtmltopdf)로 PDF 생성"""
+    options = {
+        "encoding": "UTF-8",
+        "enable-local-file-access": None,  # 로컬 폰트/이미지 접근 허용
+        "quiet": "",                       # 과도한 로그 억제(선택)
+        "margin-top": "10mm",
+        "margin-right": "10mm",
+        "margin-bottom": "12mm",
+        "margin-left": "10mm",
+    }
+    # 메모리의 HTML을 그대로 전달 (디스크 쓰기 후 재읽기 왕복 생략)
+    pdfkit.from_string(html, str(pdf_path), configuration=_wkhtml_config(), options=options)
+
+
+def _render_weasyprint(weasyprint, html: str, pdf_path: Path) -> None:
+    """WeasyPrint로 PDF 생성"""
+    weasyprint.HTML(string=html).write_pdf(str(pdf_path))
+
+
+@lru_cache(maxsize=1)
+def _reportlab_font() -> str:
+    """ReportLab 한글 폰트 등록 (프로세스당 1회), 사용할 폰트 이름 반환"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    font_regular = Path(_FONT_REGULAR_PATH)
+    if font_regular.exists():
+        try:
+            pdfmetrics.registerFont(TTFont("NotoSansKR", str(font_regular)))
+            _log("ReportLab: NotoSansKR registered")
+            return "NotoSansKR"
+        except Exception as fe:
+            _log(f"ReportLab font register failed: {fe} (fallback Helvetica)")
+    return "Helvetica"
+
+
+def _html_to_text(html: str) -> str:
+    """
+    ReportLab 폴백용 평문 추출 (<style>/<script> 제외, 엔티티 디코딩).
+    selectolax → lxml 순으로 C 구현 파서를 사용하고, 둘 다 없으면 정규식 스트립 + unescape
+    """
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        HTMLParser = None
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(["style", "script"])
+        return tree.root.text(separator="") if tree.root is not None else ""
+
+    try:
+        from lxml import html as lhtml
+    except ImportError:
+        lhtml = None
+    if lhtml is not None:
+        doc = lhtml.document_fromstring(html)
+        for el in list(doc.iter("style", "script")):
+            el.drop_tree()
+        return doc.text_content()
+
+    return unescape(_TAG_RE.sub("", html))
+
+
+def _render_reportlab(canvas, html: str, pdf_path: Path) -> None:
+    """ReportLab 폴백 (한글 폰트 등록 후 태그를 제거한 텍스트만 출력)"""
+    from reportlab.lib.pagesizes import A4
+
+    font_name = _reportlab_font()
+    c = canvas.Canvas(str(pdf_path), pagesize=A4)
+
+    # HTML → 평문 (정교한 렌더링은 상위 엔진에서 처리)
+    plain = _html_to_text(html)
+
+    # 너무 긴 줄은 110자 단위로 한 번에 분할 (간단 폴백)
+    lines = []
+    for line in plain.split("\n"):
+        line = line.strip()
+        lines.extend([line[i:i + 110] for i in range(0, len(line), 110)] or [""])
+
+    # 페이지당 줄 수: y=800에서 시작해 y<60이 되는 줄에서 페이지 넘김
+    leading = 12  # setFont 기본값(폰트 크기 × 1.2)과 동일
+    per_page = int((800 - 60) // leading) + 1
+
+    for start in range(0, len(lines), per_page):
+        text = c.beginText(40, 800)
+        text.setFont(font_name, 10, leading=leading)
+        text.textLines(lines[start:start + per_page], trim=0)
+        c.drawText(text)
+        c.showPage()
+    c.save()
+
+
+# HTML 저장 시 한 번에 인코딩할 문자 수 (전체 bytes 사본 대신 조각 단위로 인코딩 → 피크 메모리 제한)
+_HTML_WRITE_CHUNK = 1 << 20
+
+
+def _write_html(path: Path, html: str) -> None:
+    """HTML 문자열을 UTF-8로 조각 단위 인코딩하며 파일에 스트리밍 기록"""
+    with open(path, "wb", buffering=_HTML_WRITE_CHUNK) as f:
+        for i in range(0, len(html), _HTML_WRITE_CHUNK):
+            f.write(html[i:i + _HTML_WRITE_CHUNK].encode("utf-8"))
+
+
+# PDF 백엔드: 이름 → (import할 모듈, 렌더 함수). 기본 시도 순서는 pdfkit → WeasyPrint → ReportLab
+_PDF_BACKENDS = {
+    "pdfkit": ("pdfkit", _render_pdfkit),
+    "weasyprint": ("weasyprint", _render_weasyprint),
+    "reportlab": ("reportlab.pdfgen.canvas", _render_reportlab),
+}
+_PDF_BACKEND_ORDER = ("pdfkit", "weasyprint", "reportlab")
+
+# 설정된 백엔드 → 실제로 성공한 백엔드 (같은 프로세스의 두 번째 호출부터 실패할 엔진 재시도 생략)
+_PDF_BACKEND_MEMO: Dict[str, str] = {}
+
+
+@lru_cache(maxsize=None)
+def _backend_installed(module_name: str) -> bool:
+    """모듈을 실제로 import하지 않고 설치 여부만 확인 (find_spec)"""
+    return importlib.util.find_spec(module_name.partition(".")[0]) is not None
+
+
 @chain
 def export_pdf(state: AgentState) -> Dict[str, Any]:
     """
-    PDF 내보내기 노드 (pdfkit → WeasyPrint → ReportLab 폴백)
+    PDF 내보내기 노드 (output.pdf_backend 우선, 기본 pdfkit → WeasyPrint → ReportLab 폴백)
     LangChain Runnable로 래핑되어 LangSmith에 트레이싱됩니다.
     """
     print(f"[ReportCompiler] export_pdf")
@@ -659,112 +1029,75 @@ def export_pdf(state: AgentState) -> Dict[str, Any]:
     html_path = out_dir / "ev_trend_report.html"
     pdf_path = out_dir / "ev_trend_report.pdf"
 
-    # HTML 저장
-    html_path.write_text(state["draft_report_md"], encoding="utf-8")
+    # HTML 산출물 저장 여부 (output.save_html, 기본 저장). PDF 생성 실패 시에는 항상 저장
+    out_cfg = state.get("output") or {}
+    save_html = out_cfg.get("save_html", True)
+
+    # PDF 백엔드 시도 순서: output.pdf_backend(기본 pdfkit) → 나머지 기본 순서대로 폴백
+    backend = out_cfg.get("pdf_backend", _PDF_BACKEND_ORDER[0])
+    if backend not in _PDF_BACKENDS:
+        _log(f"WARN: unknown pdf_backend '{backend}', using {_PDF_BACKEND_ORDER[0]}")
+        backend = _PDF_BACKEND_ORDER[0]
+    order = [backend] + [b for b in _PDF_BACKEND_ORDER if b != backend]
+    # 이전 호출에서 성공한 백엔드가 있으면 그것부터 시도
+    known = _PDF_BACKEND_MEMO.get(backend)
+    if known and known != backend:
+        order.remove(known)
+        order.insert(0, known)
 
     ok = False
+    html = state["draft_report_md"]
+
+    # HTML 저장은 PDF 렌더링과 겹쳐서 백그라운드 스레드로 수행 (디스크 쓰기 지연을 엔진 기동 시간 뒤로 숨김)
+    html_writer = ThreadPoolExecutor(max_workers=1) if save_html else None
+    html_future = html_writer.submit(_write_html, html_path, html) if html_writer else None
 
-    # 1) pdfkit(wkhtmltopdf) 1순위
     try:
-        import pdfkit
-        wkhtml_bin_candidates = [
-            r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe",  # Windows 기본
-            r"C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe",
-            "/usr/bin/wkhtmltopdf",
-            "/usr/local/bin/wkhtmltopdf",
-        ]
-        config = None
-        for cand in wkhtml_bin_candidates:
-            if Path(cand).exists():
-                config = pdfkit.configuration(wkhtmltopdf=cand)
-                _log(f"wkhtmltopdf found: {cand}")
+        for name in order:
+            module_name, render = _PDF_BACKENDS[name]
+            if not _backend_installed(module_name):
+                _log(f"{name} not installed, skip")
+                continue
+            try:
+                _log(f"try {name}")
+                # 선택된 백엔드 모듈만 import (사용하지 않는 백엔드의 import 비용 회피)
+                render(importlib.import_module(module_name), html, pdf_path)
+                ok = True
+                _PDF_BACKEND_MEMO[backend] = name
+                _log(f"{name} success")
                 break
-
-        options = {
-            "encoding": "UTF-8",
-            "enable-local-file-access": None,  # 로컬 폰트/이미지 접근 허용
-            "quiet": "",                       # 과도한 로그 억제(선택)
-            "margin-top": "10mm",
-            "margin-right": "10mm",
-            "margin-bottom": "12mm",
-            "margin-left": "10mm",
-        }
-        _log("try pdfkit(wkhtmltopdf)")
-        pdfkit.from_file(str(html_path), str(pdf_path), configuration=config, options=options)
-        ok = True
-        _log("pdfkit success")
-    except Exception as e:
-        _log(f"pdfkit failed: {e}")
-
-    # 2) WeasyPrint 시도
-    if not ok:
+            except Exception as e:
+                _log(f"{name} failed: {e}")
+    finally:
+        # 반환 전에 백그라운드 HTML 쓰기를 항상 완료 (_done 이후에 쓰기가 남지 않도록)
+        html_saved = False
+        if html_future is not None:
+            try:
+                html_future.result()
+                html_saved = True
+            except Exception as e:
+                _log(f"HTML save failed: {e}")
+            html_writer.shutdown()
+
+    if not ok and not html_saved:
         try:
-            from weasyprint import HTML
-            _log("try WeasyPrint")
-            HTML(string=state["draft_report_md"]).write_pdf(str(pdf_path))
-            ok = True
-            _log("WeasyPrint success")
+            _write_html(html_path, html)
+            html_saved = True
         except Exception as e:
-            _log(f"WeasyPrint failed: {e}")
+            _log(f"HTML save failed: {e}")
 
-    # 3) ReportLab 폴백 (한글 폰트 등록)
-    if not ok:
-        _log("fallback to ReportLab")
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            import re
-
-            # 한글 폰트 등록 시도
-            font_name = "Helvetica"
-            font_regular = Path("assets/fonts/NotoSansKR-Regular.ttf")
-            if font_regular.exists():
-                try:
-                    pdfmetrics.registerFont(TTFont("NotoSansKR", str(font_regular)))
-                    font_name = "NotoSansKR"
-                    _log("ReportLab: NotoSansKR registered")
-                except Exception as fe:
-                    _log(f"ReportLab font register failed: {fe} (fallback Helvetica)")
-
-            c = canvas.Canvas(str(pdf_path), pagesize=A4)
-            c.setFont(font_name, 10)
-            text = c.beginText(40, 800)
-
-            # HTML 태그 제거용 아주 단순한 스트립(정교한 렌더링은 상위 엔진에서 처리)
-            plain = re.sub(r"<[^>]+>", "", state["draft_report_md"])
-            for line in plain.split("\n"):
-                # 너무 긴 줄은 잘라서 넣기 (간단 폴백)
-                line = line.strip()
-                while len(line) > 110:
-                    text.textLine(line[:110])
-                    line = line[110:]
-                    if text.getY() < 60:
-                        c.drawText(text)
-                        c.showPage()
-                        text = c.beginText(40, 800)
-                        c.setFont(font_name, 10)
-                text.textLine(line)
-                if text.getY() < 60:
-                    c.drawText(text)
-                    c.showPage()
-                    text = c.beginText(40, 800)
-                    c.setFont(font_name, 10)
-
-            c.drawText(text)
-            c.showPage()
-            c.save()
-            ok = True
-            _log("ReportLab fallback success")
-        except Exception as e:
-            _log(f"ReportLab failed: {e}")
-
-    report_path = str(pdf_path if ok else html_path)
+    # 실제로 존재하는 산출물 경로만 보고 (PDF 우선, 없으면 HTML, 둘 다 없으면 빈 문자열)
+    if ok and pdf_path.exists():
+        report_path = str(pdf_path)
+    elif html_saved and html_path.exists():
+        report_path = str(html_path)
+    else:
+        report_path = ""
 
     # _qa_document_ok는 post_export_qc에서 업데이트하므로 여기서는 제거
     return {
-        "report_path": report_path
+        "report_path": report_path,
+        "_done": True,  # should_continue 종료 플래그
     }
 
 
@@ -777,7 +1110,8 @@ def post_export_qc(state: AgentState) -> Dict[str, Any]:
     print(f"[ReportCompiler] post_export_qc")
 
     # PDF 생성 여부만 확인
-    document_ok = Path(state.get("report_path", "")).suffix.lower() == ".pdf"
+    report_path = state.get("report_path") or ""
+    document_ok = report_path[-4:].lower() == ".pdf"
     print(f"[ReportCompiler] post_export_qc - document_ok: {document_ok}")
 
     # _qa_document_ok 필드 업데이트 (버그 수정)
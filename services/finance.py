@@ -6,8 +6,10 @@
 
 핵심 제공 함수
 - fetch_price_series(ticker, period) -> dict
+- fetch_price_series_bulk(tickers, period) -> {ticker: dict}
 - compute_return_and_vol(series) -> (pct_return, volatility)
 - fetch_fundamentals(ticker) -> dict
+- fetch_fundamentals_bulk(tickers) -> {ticker: dict}
 - ensure_currency(value, from_ccy, to_ccy, fx=...) -> float
 """
 
@@ -16,13 +18,33 @@ from typing import Dict, Any, List, Tuple
 import math
 import random
 
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성: 없으면 순수 Python 계산
+    np = None
+
+# 폴백 더미 데이터용 난수 생성기 (NumPy 있을 때 배치 단위 벡터 생성)
+_RNG = np.random.default_rng() if np is not None else None
+
 
 # =============== 가격 시계열 ===============
 
+def fetch_price_series_bulk(tickers: List[str], period: str = "last_90d") -> Dict[str, Dict[str, Any]]:
+    """
+    여러 티커의 가격 시계열을 한 번에 조회해 {ticker: series} 로 반환.
+    - 실제 연결 시: yfinance.download(tickers=" ".join(tickers), period=..., group_by="ticker", threads=True)
+      한 번의 호출로 교체 (티커 수와 무관하게 1회 왕복)
+    - 오프라인 폴백: 더미 시계열 생성 (NumPy가 있으면 전체 티커를 한 번에 난수 생성)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if np is not None and tickers:
+        return _fallback_price_series_np(tickers, period)
+    return {tk: _fallback_price_series(tk, period) for tk in tickers}
+
+
 def fetch_price_series(ticker: str, period: str = "last_90d") -> Dict[str, Any]:
     """
-    티커 가격 시계열을 반환.
-    - 오프라인 폴백: 단조 증가하는 더미 가격 시계열 생성
+    티커 가격 시계열을 반환 (fetch_price_series_bulk의 단일 티커 래퍼).
     반환 예:
     {
       "ticker": "TSLA",
@@ -31,7 +53,11 @@ def fetch_price_series(ticker: str, period: str = "last_90d") -> Dict[str, Any]:
       "dates": ["2025-07-01", ...]
     }
     """
-    # 실제 구현 시: yfinance.download(..., period=...) 사용
+    return fetch_price_series_bulk([ticker], period)[ticker]
+
+
+def _fallback_price_series(ticker: str, period: str = "last_90d") -> Dict[str, Any]:
+    """오프라인 폴백: 단조 증가하는 더미 가격 시계열 생성"""
     n = 60 if "90" in period else 20
     base = 100 + random.uniform(-5, 5)
     series = [round(base + i * random.uniform(0.05, 0.8), 2) for i in range(n)]
@@ -39,6 +65,19 @@ def fetch_price_series(ticker: str, period: str = "last_90d") -> Dict[str, Any]:
     return {"ticker": ticker, "ccy": "USD", "close": series, "dates": dates}
 
 
+def _fallback_price_series_np(tickers: List[str], period: str = "last_90d") -> Dict[str, Dict[str, Any]]:
+    """오프라인 폴백 (NumPy): 티커 × 기간 난수를 한 번에 뽑아 _fallback_price_series와 같은 분포로 생성"""
+    n = 60 if "90" in period else 20
+    bases = 100 + _RNG.uniform(-5, 5, size=len(tickers))
+    steps = _RNG.uniform(0.05, 0.8, size=(len(tickers), n))
+    closes = np.round(bases[:, None] + np.arange(n) * steps, 2).tolist()
+    dates = [f"2025-07-{(i % 28)+1:02d}" for i in range(n)]
+    return {
+        tk: {"ticker": tk, "ccy": "USD", "close": closes[k], "dates": list(dates)}
+        for k, tk in enumerate(tickers)
+    }
+
+
 def compute_return_and_vol(series: Dict[str, Any]) -> Tuple[float, float]:
     """
     가격 시계열로부터 기간 수익률(%)과 단순 일간 수익률 표준편차(변동성, %)를 계산.
@@ -47,7 +86,17 @@ def compute_return_and_vol(series: Dict[str, Any]) -> Tuple[float, float]:
     if len(closes) < 2:
         return 0.0, 0.0
     ret = (closes[-1] - closes[0]) / max(1e-9, closes[0]) * 100.0
-    # 일간 로그수익률 표준편차 (간단 계산)
+
+    if np is not None:
+        # 벡터화: 인접 종가 쌍 중 양수 쌍만 골라 로그수익률 계산 후 표본 표준편차
+        c = np.asarray(closes, dtype=np.float64)
+        prev, cur = c[:-1], c[1:]
+        ok = (prev > 0) & (cur > 0)
+        logr = np.log(cur[ok] / prev[ok]) * 100.0
+        vol = float(logr.std(ddof=1)) if logr.size > 1 else 0.0
+        return round(ret, 2), round(vol, 2)
+
+    # 일간 로그수익률 표준편차 (간단 계산, NumPy 미설치 시)
     rets = []
     for i in range(1, len(closes)):
         if closes[i-1] <= 0 or closes[i] <= 0:
@@ -64,13 +113,35 @@ def compute_return_and_vol(series: Dict[str, Any]) -> Tuple[float, float]:
 
 # =============== 재무 지표 (멀티플 등) ===============
 
+def fetch_fundamentals_bulk(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 티커의 기본 재무 지표를 한 번에 조회해 {ticker: fundamentals} 로 반환.
+    실제 연결 시: 재무 API의 다중 티커 조회 1회로 교체
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if np is not None and tickers:
+        # 폴백 EPS를 전체 티커에 대해 한 번에 난수 생성
+        eps = np.round(_RNG.uniform(1.0, 6.0, size=len(tickers)), 2).tolist()
+        return {tk: _fundamentals_from_eps(tk, e) for tk, e in zip(tickers, eps)}
+    return {tk: _fallback_fundamentals(tk) for tk in tickers}
+
+
 def fetch_fundamentals(ticker: str) -> Dict[str, Any]:
+    """기본 재무 지표 조회 (fetch_fundamentals_bulk의 단일 티커 래퍼)"""
+    return fetch_fundamentals_bulk([ticker])[ticker]
+
+
+def _fallback_fundamentals(ticker: str) -> Dict[str, Any]:
     """
     기본 재무 지표 폴백.
     실제 연결 시: 재무 API에서 EPS/시총/멀티플 등 조회
     """
     # 폴백: 임의 값
-    eps_ttm = round(random.uniform(1.0, 6.0), 2)
+    return _fundamentals_from_eps(ticker, round(random.uniform(1.0, 6.0), 2))
+
+
+def _fundamentals_from_eps(ticker: str, eps_ttm: float) -> Dict[str, Any]:
+    """폴백 EPS로 재무 지표 dict 구성 (고정 가격 120.0 기준 PER)"""
     price = 120.0
     per = round(price / eps_ttm, 2) if eps_ttm else None
     return {
@@ -83,18 +154,19 @@ def fetch_fundamentals(ticker: str) -> Dict[str, Any]:
 
 # =============== 통화 변환 ===============
 
+# 폴백 환율 (예시): 1 USD = 1300 KRW. 미지정 통화쌍은 변환 안 함(1.0)
+_FX_DEFAULT: Dict[Tuple[str, str], float] = {
+    ("USD", "KRW"): 1300.0,
+    ("KRW", "USD"): 1 / 1300.0,
+}
+
+
 def ensure_currency(value: float, from_ccy: str, to_ccy: str, fx: float | None = None) -> float:
     """
     통화 변환. fx가 없으면 간단 폴백 환율 사용.
     """
     if from_ccy == to_ccy:
         return value
-    # 폴백 환율 (예시): 1 USD = 1300 KRW
     if fx is None:
-        if from_ccy == "USD" and to_ccy == "KRW":
-            fx = 1300.0
-        elif from_ccy == "KRW" and to_ccy == "USD":
-            fx = 1 / 1300.0
-        else:
-            fx = 1.0  # 미지정 통화쌍은 변환 안 함
+        fx = _FX_DEFAULT.get((from_ccy, to_ccy), 1.0)
     return value * fx
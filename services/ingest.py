@@ -12,42 +12,117 @@
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, TypedDict
+import asyncio
+import hashlib
 import os
-
-
-@dataclass
-class SourceDoc:
-    """수집한 원문 문서의 최소 메타 스키마"""
-    title: str
-    url: str
-    date: str              # ISO (YYYY-MM-DD)
-    kind: str              # news | policy | ir | report | blog | pdf
-    lang: str = "ko"
-    text: Optional[str] = None
-    source: str = "dummy"  # origin label
-    region: Optional[str] = None
-    company: Optional[str] = None
-    issue_tags: Optional[List[str]] = None
+import time
+from services.jsonutil import dumps_bytes, loads
+
+
+class SourceDoc(TypedDict):
+    """수집한 원문 문서의 최소 메타 스키마 (_make_source_doc가 모든 키를 채움, 미지정 값은 None)"""
+    title: Optional[str]
+    url: Optional[str]
+    date: Optional[str]    # ISO (YYYY-MM-DD)
+    kind: Optional[str]    # news | policy | ir | report | blog | pdf
+    lang: str
+    text: Optional[str]
+    source: str            # origin label
+    region: Optional[str]
+    company: Optional[str]
+    issue_tags: Optional[List[str]]
+
+
+# SourceDoc 기본값 (키 순서 = 스키마 순서, 레코드/evidence 출력 순서 유지)
+_SOURCE_DOC_DEFAULTS: SourceDoc = {
+    "title": None,
+    "url": None,
+    "date": None,
+    "kind": None,
+    "lang": "ko",
+    "text": None,
+    "source": "dummy",
+    "region": None,
+    "company": None,
+    "issue_tags": None,
+}
+
+
+def _make_source_doc(**fields: Any) -> SourceDoc:
+    """기본값을 채운 SourceDoc dict 생성 (dataclass 생성 + dict 변환 과정 없이 바로 레코드로 사용)"""
+    doc = _SOURCE_DOC_DEFAULTS.copy()
+    doc.update(fields)
+    return doc
+
+
+# Tavily 동시 검색 상한 (rate limit 보호, HTTP 커넥션 풀 크기와 동일)
+_SEARCH_CONCURRENCY = 10
+# 실행 중인 이벤트 루프 안에서 호출된 경우 워커 스레드 검색 전체의 대기 상한 (초)
+_SEARCH_TIMEOUT_S = 120
 
 
 def _today_iso() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
+def _make_http_session():
+    """
+    Tavily 호출용 커넥션 풀 세션 (TCP/TLS 핸드셰이크를 쿼리 간 재사용).
+    풀 크기는 동시 검색 상한에 맞추고, 연결 실패는 짧은 백오프로 재시도합니다.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except ImportError:
+        return None
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=_SEARCH_CONCURRENCY,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# 생성에 성공한 Tavily 클라이언트 (실패(None)는 캐시하지 않음)
+_TAVILY_CLIENT: Dict[str, Any] = {}
+
+
 def _get_tavily_client():
     """
-    Tavily 클라이언트를 가져옵니다.
-    환경 변수 TAVILY_API_KEY가 필요합니다.
+    Tavily 클라이언트를 가져옵니다. (최초 성공 시 1회 생성 후 모든 동시 검색에서 공유)
+    환경 변수 TAVILY_API_KEY가 필요합니다. 키가 없거나 패키지가 없으면 None을 반환하며,
+    이 결과는 캐시하지 않으므로 같은 프로세스에서 키를 설정하면 다음 호출부터 검색합니다.
     """
+    client = _TAVILY_CLIENT.get("client")
+    if client is None:
+        client = _create_tavily_client()
+        if client is not None:
+            _TAVILY_CLIENT["client"] = client
+    return client
+
+
+def _create_tavily_client():
+    """Tavily 클라이언트 생성 (사용 불가 시 None)"""
     try:
         from tavily import TavilyClient
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             print("[Ingest] WARNING: TAVILY_API_KEY not found. Using fallback mode.")
             return None
+        session = _make_http_session()
+        if session is not None:
+            try:
+                return TavilyClient(api_key=api_key, session=session)
+            except TypeError:  # session 인자를 받지 않는 구버전 tavily-python
+                pass
         return TavilyClient(api_key=api_key)
     except ImportError:
         print("[Ingest] WARNING: tavily-python not installed. Using fallback mode.")
@@ -57,37 +132,103 @@ def _get_tavily_client():
         return None
 
 
-def _search_with_tavily(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+# 검색 결과 1건당 보관할 본문 최대 길이 (SourceDoc.text 상한과 동일)
+_MAX_CONTENT_CHARS = 5000
+
+# Tavily 검색 결과 캐시 ((query, max_results) 해시 → 결과, TTL 1일)
+SEARCH_CACHE_DIR = Path("outputs/.search_cache")
+_SEARCH_CACHE_TTL_S = 24 * 60 * 60
+_SEARCH_MEMO: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _search_cache_key(query: str, max_results: int, depth: str = "basic", raw: bool = False) -> str:
+    return hashlib.blake2b(
+        f"{max_results}\0{depth}\0{int(raw)}\0{query}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _search_cache_get(key: str) -> Optional[List[Dict[str, Any]]]:
+    """메모리 → outputs/.search_cache/<hash>.json 순서로 조회 (TTL 경과 항목은 무시)"""
+    now = time.time()
+    hit = _SEARCH_MEMO.get(key)
+    if hit is not None and now - hit[0] < _SEARCH_CACHE_TTL_S:
+        return hit[1]
+    cache_file = SEARCH_CACHE_DIR / f"{key}.json"
+    try:
+        mtime = cache_file.stat().st_mtime
+        if now - mtime >= _SEARCH_CACHE_TTL_S:
+            return None
+        results = loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[Ingest] WARNING: Failed to read search cache: {e}")
+        return None
+    _SEARCH_MEMO[key] = (mtime, results)
+    return results
+
+
+def _search_cache_put(key: str, results: List[Dict[str, Any]]) -> None:
+    _SEARCH_MEMO[key] = (time.time(), results)
+    try:
+        SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (SEARCH_CACHE_DIR / f"{key}.json").write_bytes(dumps_bytes(results))
+    except Exception as e:
+        print(f"[Ingest] WARNING: Failed to write search cache: {e}")
+
+
+def _search_with_tavily(
+    query: str,
+    max_results: int = 5,
+    depth: str = "basic",
+    raw: bool = False,
+) -> List[Dict[str, Any]]:
     """
     Tavily API를 사용하여 웹 검색을 수행합니다.
+    같은 (query, max_results, depth, raw)는 TTL(1일) 동안 캐시된 결과를 재사용합니다. (빈 결과/오류는 캐시하지 않음)
+
+    Args:
+        depth: Tavily search_depth. 하위 단계가 본문을 5000자(요약 1000자, RAG 스니펫 500자)로 자르므로
+               기본은 "basic" (advanced는 응답이 느리고 API 크레딧을 더 소모)
+        raw: True면 원문 전체(raw_content)를 요청해 우선 사용 (긴 본문이 필요한 경로에서만)
 
     Returns:
         List of documents with 'title', 'url', 'content', 'published_date'
     """
+    cache_key = _search_cache_key(query, max_results, depth, raw)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        print(f"[Ingest] Tavily cache hit: '{query}' ({len(cached)} results)")
+        return cached
+
     client = _get_tavily_client()
     if not client:
         return []
 
     try:
-        print(f"[Ingest] Tavily search: '{query}' (max_results={max_results})")
+        print(f"[Ingest] Tavily search: '{query}' (max_results={max_results}, depth={depth})")
         response = client.search(
             query=query,
             max_results=max_results,
-            search_depth="advanced",  # 더 깊은 검색
-            include_raw_content=True  # 전체 콘텐츠 포함
+            search_depth=depth,
+            include_raw_content=raw  # 기본: 본문(content) 요약만 사용 → 원문 전체 전송 생략
         )
+        body_keys = ("raw_content", "content") if raw else ("content", "raw_content")
 
         results = []
         for item in response.get("results", []):
             results.append({
                 "title": item.get("title", "Untitled"),
                 "url": item.get("url", ""),
-                "content": item.get("content", "") or item.get("raw_content", ""),
+                # 수집 경계에서 바로 잘라 긴 원문이 메모리/캐시에 남지 않도록 함
+                "content": (item.get(body_keys[0]) or item.get(body_keys[1]) or "")[:_MAX_CONTENT_CHARS],
                 "published_date": item.get("published_date", None),
                 "score": item.get("score", 0.0)
             })
 
         print(f"[Ingest] Tavily returned {len(results)} results")
+        if results:
+            _search_cache_put(cache_key, results)
         return results
 
     except Exception as e:
@@ -95,6 +236,45 @@ def _search_with_tavily(query: str, max_results: int = 5) -> List[Dict[str, Any]
         return []
 
 
+async def _asearch_all(queries: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+    """(query, max_results) 목록을 동시에 검색하여 입력 순서대로 결과 반환"""
+    sem = asyncio.Semaphore(_SEARCH_CONCURRENCY)
+
+    async def _one(query: str, max_results: int) -> List[Dict[str, Any]]:
+        async with sem:
+            return await asyncio.to_thread(_search_with_tavily, query, max_results)
+
+    return await asyncio.gather(*(_one(q, n) for q, n in queries))
+
+
+def _search_many(queries: List[Tuple[str, int]]) -> List[List[Dict[str, Any]]]:
+    """
+    동기 호출부(LangGraph 노드)용 래퍼.
+    검색 지연이 Σ(latency)가 아닌 max(latency)에 수렴하도록 asyncio.gather로 실행합니다.
+    이미 이벤트 루프가 실행 중이면(async invoke, Jupyter 등 asyncio.run 불가)
+    워커 스레드의 새 루프에서 실행하고 _SEARCH_TIMEOUT_S까지만 대기합니다.
+    """
+    if not queries:
+        return []
+    if _get_tavily_client() is None:
+        # 클라이언트 없음(키 미설정/미설치): 캐시만 조회하고 이벤트 루프·스레드 기동 생략
+        return [_search_cache_get(_search_cache_key(q, n)) or [] for q, n in queries]
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_asearch_all(queries))
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        return pool.submit(asyncio.run, _asearch_all(queries)).result(timeout=_SEARCH_TIMEOUT_S)
+    except TimeoutError:
+        print(f"[Ingest] WARNING: Tavily searches timed out after {_SEARCH_TIMEOUT_S}s")
+        return [[] for _ in queries]
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 # =============== 시장/정책/뉴스 수집 ===============
 
 def fetch_market_sources(
@@ -111,6 +291,7 @@ def fetch_market_sources(
     - 네트워크 실패 시 더미 데이터 반환
     """
     docs: List[SourceDoc] = []
+    default_date = snapshot_date or _today_iso()  # 날짜 없는 문서의 기본값 (호출당 1회 계산)
 
     # Tavily로 실제 검색 수행
     try:
@@ -124,27 +305,25 @@ def fetch_market_sources(
             f"{issues_str} electric vehicle policy {regions_str}",
         ]
 
-        for query in queries:
-            results = _search_with_tavily(query, max_results=3)
-
+        for results in _search_many([(q, 3) for q in queries]):
             for result in results:
-                # Tavily 결과를 SourceDoc으로 변환
-                doc = SourceDoc(
+                # Tavily 결과를 SourceDoc 레코드로 변환
+                doc = _make_source_doc(
                     title=result["title"],
                     url=result["url"],
-                    date=result.get("published_date") or snapshot_date or _today_iso(),
+                    date=result.get("published_date") or default_date,
                     kind="news",
                     lang="en",
                     source="tavily",
                     region=regions[0] if regions else "global",
                     issue_tags=focus_issues if focus_issues else [],
-                    text=result["content"][:5000]  # 처음 5000자만 사용
+                    text=result["content"][:_MAX_CONTENT_CHARS]  # 처음 5000자만 사용
                 )
                 docs.append(doc)
 
         if docs:
             print(f"[Ingest] Fetched {len(docs)} real documents from Tavily")
-            return [asdict(d) for d in docs]
+            return docs
 
     except Exception as e:
         print(f"[Ingest] ERROR during market source fetch: {e}")
@@ -153,10 +332,10 @@ def fetch_market_sources(
     if offline_ok:
         print("[Ingest] Using fallback dummy data for market sources")
         docs = [
-            SourceDoc(
+            _make_source_doc(
                 title="Global EV Sales Update",
                 url="https://example.com/ev",
-                date=snapshot_date or _today_iso(),
+                date=default_date,
                 kind="news",
                 lang="en",
                 source="example",
@@ -164,10 +343,10 @@ def fetch_market_sources(
                 issue_tags=["demand_softness"],
                 text="Global EV sales growth slowed in the last quarter...",
             ),
-            SourceDoc(
+            _make_source_doc(
                 title="EU Subsidy Change",
                 url="https://example.com/eu",
-                date=snapshot_date or _today_iso(),
+                date=default_date,
                 kind="policy",
                 lang="en",
                 source="example",
@@ -176,7 +355,7 @@ def fetch_market_sources(
                 text="EU adjusted EV subsidy eligibility rules affecting OEM lineups...",
             ),
         ]
-        return [asdict(d) for d in docs]
+        return docs
 
     return []
 
@@ -196,39 +375,44 @@ def fetch_company_sources(
     - Tavily API를 사용하여 각 기업별 최신 정보 검색
     - 네트워크 실패 시 더미 IR 한 건씩 생성
     """
+    if not benchmarks:
+        return []
+
     docs: List[SourceDoc] = []
+    default_date = snapshot_date or _today_iso()  # 날짜 없는 문서의 기본값 (호출당 1회 계산)
 
     # Tavily로 실제 검색 수행
     try:
-        for tk in benchmarks or []:
-            # 기업별 검색 쿼리
+        # 기업별 검색 쿼리 (모든 기업의 쿼리를 한 번에 동시 실행)
+        company_queries = []
+        for tk in benchmarks:
             queries = [
                 f"{tk} electric vehicle business strategy pricing {period}",
                 f"{tk} EV battery technology supply chain news",
                 f"{tk} quarterly earnings revenue forecast {period}",
             ]
+            company_queries.extend((tk, q) for q in queries[:2])  # 각 기업당 2개 쿼리만 실행
 
-            for query in queries[:2]:  # 각 기업당 2개 쿼리만 실행
-                results = _search_with_tavily(query, max_results=2)
-
-                for result in results:
-                    doc = SourceDoc(
-                        title=result["title"],
-                        url=result["url"],
-                        date=result.get("published_date") or snapshot_date or _today_iso(),
-                        kind="ir",
-                        lang="en",
-                        source="tavily",
-                        region=None,
-                        company=tk,
-                        issue_tags=["pricing", "battery", "strategy"],
-                        text=result["content"][:5000]  # 처음 5000자만 사용
-                    )
-                    docs.append(doc)
+        all_results = _search_many([(q, 2) for _, q in company_queries])
+        for (tk, _), results in zip(company_queries, all_results):
+            for result in results:
+                doc = _make_source_doc(
+                    title=result["title"],
+                    url=result["url"],
+                    date=result.get("published_date") or default_date,
+                    kind="ir",
+                    lang="en",
+                    source="tavily",
+                    region=None,
+                    company=tk,
+                    issue_tags=["pricing", "battery", "strategy"],
+                    text=result["content"][:_MAX_CONTENT_CHARS]  # 처음 5000자만 사용
+                )
+                docs.append(doc)
 
         if docs:
             print(f"[Ingest] Fetched {len(docs)} real company documents from Tavily")
-            return [asdict(d) for d in docs]
+            return docs
 
     except Exception as e:
         print(f"[Ingest] ERROR during company source fetch: {e}")
@@ -236,12 +420,12 @@ def fetch_company_sources(
     # 폴백: 더미 데이터
     if offline_ok:
         print("[Ingest] Using fallback dummy data for company sources")
-        for tk in benchmarks or []:
+        for tk in benchmarks:
             docs.append(
-                SourceDoc(
+                _make_source_doc(
                     title=f"{tk} IR Deck",
                     url=f"https://example.com/{tk}",
-                    date=snapshot_date or _today_iso(),
+                    date=default_date,
                     kind="ir",
                     lang="en",
                     source="example",
@@ -251,13 +435,18 @@ def fetch_company_sources(
                     text=f"{tk} discusses pricing strategy, margin pressure, and battery integration.",
                 )
             )
-        return [asdict(d) for d in docs]
+        return docs
 
     return []
 
 
 # =============== 정규화/후처리 ===============
 
+# 정규화 시 레코드 텍스트 상한과 잘림 표식
+_MAX_TEXT_CHARS = 8000
+_TRUNC_SUFFIX = "\n...[truncated]"
+
+
 def normalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     수집 레코드 정규화:
@@ -266,18 +455,19 @@ def normalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     - 텍스트 길이 제한(너무 긴 경우 앞부분만 저장)
     """
     out = []
+    today = _today_iso()  # 누락/잘못된 날짜 대체값 (레코드마다 datetime.now() 호출 방지)
     for r in records:
-        # SourceDoc 객체일 경우 딕셔너리로 변환
+        # dataclass 레코드일 경우 딕셔너리로 변환
         if hasattr(r, '__dataclass_fields__'):
             r = asdict(r)
         else:
             r = dict(r)
         # 날짜 보정
-        date = r.get("date") or _today_iso()
+        date = r.get("date") or today
         try:
             _ = datetime.fromisoformat(date)
         except Exception:
-            date = _today_iso()
+            date = today
         r["date"] = date
 
         # 필수 기본값
@@ -289,8 +479,9 @@ def normalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         r.setdefault("text", None)
 
         # 텍스트 길이 제한
-        if isinstance(r.get("text"), str) and len(r["text"]) > 8000:
-            r["text"] = r["text"][:8000] + "\n...[truncated]"
+        text = r["text"]
+        if isinstance(text, str) and len(text) > _MAX_TEXT_CHARS:
+            r["text"] = f"{text[:_MAX_TEXT_CHARS]}{_TRUNC_SUFFIX}"
 
         out.append(r)
     return out
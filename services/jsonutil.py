@@ -0,0 +1,58 @@
+# services/jsonutil.py
+"""
+JSON 직렬화 유틸리티.
+- orjson이 설치되어 있으면 사용 (C 구현, bytes 직접 생성, NumPy 타입 지원)
+- 없으면 표준 json 모듈 폴백 (구분자·비ASCII 처리를 orjson과 맞춘 compact 출력)
+  단, 비문자열 키 변환·정렬, float 표기, NumPy 값 처리 등 세부 바이트는 백엔드별로 다를 수 있음
+
+핵심 제공 함수
+- dumps(obj, sort_keys=False, indent=False) -> str
+- dumps_bytes(obj, sort_keys=False, indent=False) -> bytes
+- loads(data) -> Any
+"""
+
+from __future__ import annotations
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """NumPy 스칼라/배열 등 기본 타입이 아닌 값 변환 (변환 불가 시 문자열)"""
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    if hasattr(o, "item"):
+        return o.item()
+    return str(o)
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """obj를 UTF-8 JSON bytes로 직렬화 (ensure_ascii=False 와 동일하게 비ASCII 문자 유지)"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, default=_default,
+        separators=(",", ": ") if indent else (",", ":"),  # orjson과 같은 구분자 (compact / OPT_INDENT_2)
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    """obj를 JSON 문자열로 직렬화"""
+    return dumps_bytes(obj, sort_keys=sort_keys, indent=indent).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """JSON 문자열/bytes 파싱 (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
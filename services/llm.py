@@ -3,10 +3,25 @@
 LLM 호출 유틸리티
 OpenAI GPT-4o-mini를 사용하여 텍스트 생성
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
+from functools import lru_cache
+import hashlib
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from services.jsonutil import loads
+
+try:
+    from langchain_openai import ChatOpenAI
+except ImportError:  # 선택 의존성: 없으면 폴백 모드
+    ChatOpenAI = None
+
+
+# 인용 번호 패턴 (모듈 로드 시 1회 컴파일)
+_CITATION_RUN = re.compile(r'(?:\[\d+\])+')  # 연속된 [n][n]... 묶음
+_CITATION_NUM = re.compile(r'\[(\d+)\]')     # 개별 [n]의 번호
 
 
 def clean_citations(text: str) -> str:
@@ -14,67 +29,133 @@ def clean_citations(text: str) -> str:
     중복된 인용 번호를 제거합니다.
     예: '[1][1]' -> '[1]', '[2][3][2]' -> '[2][3]'
     """
-    if not text:
+    if not text or '[' not in text:  # 인용이 없으면 정규식 스캔 생략
         return text
 
     # 연속된 인용 패턴 찾기
     def deduplicate_citations(match):
-        citations = re.findall(r'\[(\d+)\]', match.group(0))
-        # 중복 제거하되 순서 유지
-        seen = set()
-        unique_citations = []
-        for c in citations:
-            if c not in seen:
-                seen.add(c)
-                unique_citations.append(c)
-        return ''.join([f'[{c}]' for c in unique_citations])
+        s = match.group(0)
+        if s.count('[') == 1:  # 단일 인용 [n] (가장 흔한 경우): 그대로 반환
+            return s
+        citations = _CITATION_NUM.findall(s)
+        # 중복 제거하되 순서 유지 (dict.fromkeys: 삽입 순서 보존)
+        unique_citations = list(dict.fromkeys(citations))
+        if len(unique_citations) == len(citations):  # 중복 없음: 재조립 생략
+            return s
+        return '[' + ']['.join(unique_citations) + ']'
 
     # 연속된 [n][n]... 패턴을 찾아서 중복 제거
-    cleaned = re.sub(r'(?:\[\d+\])+', deduplicate_citations, text)
+    cleaned = _CITATION_RUN.sub(deduplicate_citations, text)
     return cleaned
 
 
-def get_llm():
+# LLM 응답 캐시 (동일 프롬프트·모델 파라미터 재호출 시 API 왕복 생략). 기본 비활성화 (opt-in)
+# LLM_CACHE_DB에 SQLite 경로를 지정한 경우에만 사용 (예: outputs/.llm_cache.db)
+_LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "")
+
+# 디버그 출력 (프롬프트 점검, 원문 응답 미리보기). 기본 비활성화 → 매 호출 슬라이스/출력 생략
+_LLM_DEBUG = os.getenv("LLM_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+@lru_cache(maxsize=1)
+def _enable_llm_cache() -> None:
     """
-    LLM 인스턴스를 가져옵니다.
-    환경 변수 OPENAI_API_KEY가 필요합니다.
-    LangSmith 트레이싱을 지원합니다.
+    LangChain 전역 LLM 캐시를 SQLite로 설정 (프로세스당 1회, LLM_CACHE_DB 설정 시에만).
+    키는 (프롬프트 전문, 모델/파라미터)이므로 입력 문서·이슈가 같은 재실행에서만 적중하며,
+    적중 시 temperature와 무관하게 저장된 응답이 그대로 반환됩니다.
+    langchain-community가 없으면 캐시 없이 동작합니다.
     """
+    if not _LLM_CACHE_DB:
+        return
+    try:
+        from langchain_core.globals import set_llm_cache
+        from langchain_community.cache import SQLiteCache
+    except ImportError:
+        print("[LLM] WARNING: langchain-community not installed. LLM response cache disabled.")
+        return
     try:
-        from langchain_openai import ChatOpenAI
+        Path(_LLM_CACHE_DB).parent.mkdir(parents=True, exist_ok=True)
+        set_llm_cache(SQLiteCache(database_path=_LLM_CACHE_DB))
+        print(f"[LLM] Response cache enabled: {_LLM_CACHE_DB}")
+    except Exception as e:
+        print(f"[LLM] WARNING: Failed to enable response cache: {e}")
+
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            print("[LLM] WARNING: OPENAI_API_KEY not found. Using fallback mode.")
+# 모델 설정 (섹션 캐시 키에도 포함 → 변경 시 compose 캐시 자동 무효화)
+_LLM_MODEL = "gpt-4o-mini"
+_LLM_TEMPERATURE = 0.3
+
+# 생성에 성공한 ChatOpenAI 인스턴스 캐시 (json_mode → 인스턴스). 실패(None)는 캐시하지 않음
+_LLM_INSTANCES: Dict[bool, Any] = {}
+
+
+def _build_llm(json_mode: bool):
+    """
+    ChatOpenAI 인스턴스 반환 (모드별 최초 성공 시 1회 생성 후 재사용, 내부 httpx 커넥션 풀도 함께 재사용)
+    환경 변수 OPENAI_API_KEY가 필요합니다. 키가 없거나 패키지가 없으면 None을 반환하며,
+    이 결과는 캐시하지 않으므로 같은 프로세스에서 키를 설정하면 다음 호출부터 LLM을 사용합니다.
+    LangSmith 트레이싱을 지원합니다.
+    """
+    llm = _LLM_INSTANCES.get(json_mode)
+    if llm is None:
+        llm = _create_llm(json_mode)
+        if llm is not None:
+            _LLM_INSTANCES[json_mode] = llm
+    return llm
+
+
+def _create_llm(json_mode: bool):
+    """ChatOpenAI 인스턴스 생성 (사용 불가 시 None)"""
+    global ChatOpenAI
+    if ChatOpenAI is None:
+        try:  # 모듈 로드 이후 설치된 경우 재시도
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            print("[LLM] WARNING: langchain-openai not installed. Using fallback mode.")
             return None
 
-        # LangSmith 트레이싱 정보 로그
-        langchain_tracing = os.getenv("LANGCHAIN_TRACING_V2", "false")
-        langchain_project = os.getenv("LANGCHAIN_PROJECT", "default")
-        print(f"[LLM] Creating ChatOpenAI instance - Tracing: {langchain_tracing}, Project: {langchain_project}")
-
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            api_key=api_key,
-            model_kwargs={
-                "response_format": {"type": "json_object"}  # JSON 모드 강제
-            },
-            # LangSmith 메타데이터 추가
-            metadata={
-                "project": langchain_project,
-                "agent_type": "market_analyzer"
-            }
-        )
-        return llm
-    except ImportError:
-        print("[LLM] WARNING: langchain-openai not installed. Using fallback mode.")
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("[LLM] WARNING: OPENAI_API_KEY not found. Using fallback mode.")
         return None
 
+    _enable_llm_cache()
+
+    # LangSmith 트레이싱 정보 로그
+    langchain_tracing = os.getenv("LANGCHAIN_TRACING_V2", "false")
+    langchain_project = os.getenv("LANGCHAIN_PROJECT", "default")
+    mode = "instance" if json_mode else "(text mode)"
+    print(f"[LLM] Creating ChatOpenAI {mode} - Tracing: {langchain_tracing}, Project: {langchain_project}")
+
+    kwargs: Dict[str, Any] = {}
+    if json_mode:
+        kwargs["model_kwargs"] = {
+            "response_format": {"type": "json_object"}  # JSON 모드 강제
+        }
+    return ChatOpenAI(
+        model=_LLM_MODEL,
+        temperature=_LLM_TEMPERATURE,
+        api_key=api_key,
+        # LangSmith 메타데이터 추가
+        metadata={
+            "project": langchain_project,
+            "agent_type": "market_analyzer" if json_mode else "section_generator"
+        },
+        **kwargs,
+    )
 
+
+def get_llm():
+    """
+    LLM 인스턴스를 가져옵니다. (JSON 모드, 프로세스당 1회 생성 후 재사용)
+    """
+    return _build_llm(True)
+
+
+@lru_cache(maxsize=16)
 def load_prompt_template(prompt_file: str) -> str:
     """
-    프롬프트 템플릿 파일을 로드합니다.
+    프롬프트 템플릿 파일을 로드합니다. (파일별 1회 읽기 후 캐시)
     """
     prompt_path = Path("prompts") / prompt_file
     if prompt_path.exists():
@@ -164,32 +245,24 @@ Please respond with a JSON object in this format (content must be in KOREAN):
     try:
         from langchain_core.messages import HumanMessage
         import json
-        import re
 
-        # 디버깅: 프롬프트에 'json' 키워드가 포함되어 있는지 확인
-        if 'json' not in prompt.lower():
-            print(f"[LLM] WARNING: Prompt does not contain 'json' keyword!")
-            print(f"[LLM] Prompt preview: {prompt[:200]}")
-        else:
-            print(f"[LLM] Prompt contains 'json' keyword - OK")
+        # 디버깅: 프롬프트에 'json' 키워드가 포함되어 있는지 확인 (LLM_DEBUG 설정 시에만)
+        if _LLM_DEBUG:
+            if 'json' not in prompt.lower():
+                print(f"[LLM] WARNING: Prompt does not contain 'json' keyword!")
+                print(f"[LLM] Prompt preview: {prompt[:200]}")
+            else:
+                print(f"[LLM] Prompt contains 'json' keyword - OK")
 
         response = llm.invoke([HumanMessage(content=prompt)])
-        print(f"[LLM] Raw response type: {type(response.content)}")
-        print(f"[LLM] Raw response (first 500 chars): {response.content[:500]}")
+        if _LLM_DEBUG:
+            print(f"[LLM] Raw response type: {type(response.content)}")
+            print(f"[LLM] Raw response (first 500 chars): {response.content[:500]}")
 
-        # JSON 파싱 시도
-        response_text = response.content.strip()
+        # JSON 파싱 시도 (마크다운 코드 블록으로 감싸진 경우 제거)
+        response_text = _strip_code_fence(response.content, "json")
 
-        # 마크다운 코드 블록으로 감싸진 경우 제거
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]  # ```json 제거
-        if response_text.startswith("```"):
-            response_text = response_text[3:]  # ``` 제거
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]  # ``` 제거
-        response_text = response_text.strip()
-
-        result = json.loads(response_text)
+        result = loads(response_text)
 
         # 중복 인용 제거
         if "top_trends" in result:
@@ -201,7 +274,7 @@ Please respond with a JSON object in this format (content must be in KOREAN):
         if "referenced_docs" not in result:
             # top_trends와 summary에서 [n] 패턴 추출
             text = " ".join(result.get("top_trends", [])) + " " + result.get("summary", "")
-            citations = re.findall(r'\[(\d+)\]', text)
+            citations = _CITATION_NUM.findall(text)
             result["referenced_docs"] = sorted(list(set(int(c) for c in citations)))
 
         print(f"[LLM] Successfully parsed JSON response with {len(result.get('top_trends', []))} trends")
@@ -245,44 +318,36 @@ def summarize_market_trends(
     return summarize_market_trends_with_global_refs(documents, focus_issues, regions, period, start_ref_number=1)
 
 
-def summarize_company_info(
-    ticker: str,
-    documents: List[Dict[str, Any]],
-    aspect: str  # "business" | "risk" | "roadmap"
-) -> Dict[str, Any]:
-    """
-    기업 관련 문서를 LLM으로 요약합니다.
+def _company_summary_fallback(ticker: str, aspect: str) -> Dict[str, Any]:
+    return {
+        "points": [f"{ticker} {aspect} - LLM 미사용 더미 데이터"],
+        "referenced_docs": []
+    }
 
-    Returns:
-        {
-            "points": ["포인트1[n]", ...],
-            "referenced_docs": [1, 2]
-        }
-    """
-    llm = get_llm()
 
-    if not llm:
-        return {
-            "points": [f"{ticker} {aspect} - LLM 미사용 더미 데이터"],
-            "referenced_docs": []
-        }
+_ASPECT_MAP = {
+    "business": "사업 전략, 가격 정책, 마진 관련",
+    "risk": "리스크 요인, 규제, 공급망 이슈",
+    "roadmap": "로드맵, 신모델, 생산 계획"
+}
 
+
+def _company_summary_prompt(
+    ticker: str,
+    documents: List[Dict[str, Any]],
+    aspect: str
+) -> str:
+    """기업 요약 프롬프트 구성 (단건/배치 공용)"""
     context = "\n\n".join([
         f"[문서 {i+1}] {doc.get('title', 'Untitled')}\n{doc.get('snippet', '')}"
         for i, doc in enumerate(documents[:5])
     ])
 
-    aspect_map = {
-        "business": "사업 전략, 가격 정책, 마진 관련",
-        "risk": "리스크 요인, 규제, 공급망 이슈",
-        "roadmap": "로드맵, 신모델, 생산 계획"
-    }
-
     prompt = f"""Analyze the company information and respond with a JSON object in KOREAN language.
 
 **IMPORTANT: Write all content in KOREAN (한글). Only company names and technical terms can be in English.**
 
-기업 {ticker}의 {aspect_map.get(aspect, aspect)} 관련 정보를 분석하여
+기업 {ticker}의 {_ASPECT_MAP.get(aspect, aspect)} 관련 정보를 분석하여
 3-5개의 핵심 포인트를 추출하세요. 각 포인트는 한 문장으로 작성하세요.
 
 **작성 언어**: 반드시 한글로 작성하세요. 기업명, 기술 용어는 영어 가능.
@@ -302,34 +367,25 @@ Please respond with a JSON object in this format (content must be in KOREAN):
   "points": ["포인트1[n]", "포인트2[n]", "포인트3[n]"],
   "referenced_docs": [1, 2, 3]
 }}"""
+    return prompt
 
-    try:
-        from langchain_core.messages import HumanMessage
-        import json
-        import re
-
-        response = llm.invoke([HumanMessage(content=prompt)])
 
-        # JSON 파싱 시도
-        response_text = response.content.strip()
+def _parse_company_summary(ticker: str, content: str) -> Dict[str, Any]:
+    """기업 요약 LLM 응답(JSON) 파싱 + 중복 인용 제거 (단건/배치 공용)"""
+    import json
 
-        # 마크다운 코드 블록으로 감싸진 경우 제거
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+    try:
+        # JSON 파싱 시도 (마크다운 코드 블록으로 감싸진 경우 제거)
+        response_text = _strip_code_fence(content, "json")
 
-        result = json.loads(response_text)
+        result = loads(response_text)
 
         # 이전 버전 호환성: 리스트로 반환된 경우 Dict로 변환
         if isinstance(result, list):
             # 중복 인용 제거
             cleaned_points = [clean_citations(p) for p in result]
             text = " ".join(cleaned_points)
-            citations = re.findall(r'\[(\d+)\]', text)
+            citations = _CITATION_NUM.findall(text)
             return {
                 "points": cleaned_points,
                 "referenced_docs": sorted(list(set(int(c) for c in citations)))
@@ -342,96 +398,132 @@ Please respond with a JSON object in this format (content must be in KOREAN):
         # referenced_docs가 없으면 텍스트에서 추출
         if "referenced_docs" not in result:
             text = " ".join(result.get("points", []))
-            citations = re.findall(r'\[(\d+)\]', text)
+            citations = _CITATION_NUM.findall(text)
             result["referenced_docs"] = sorted(list(set(int(c) for c in citations)))
 
         return result
     except json.JSONDecodeError as e:
         print(f"[LLM] JSON parsing error in company summarization: {e}")
-        print(f"[LLM] Raw response: {response.content}")
+        print(f"[LLM] Raw response: {content}")
         return {
             "points": [f"{ticker} 정보 수집 중 (JSON 파싱 오류)"],
             "referenced_docs": []
         }
     except Exception as e:
-        print(f"[LLM] Error during company summarization: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "points": [f"오류: {str(e)}"],
-            "referenced_docs": []
-        }
+        return _company_summary_error(e)
 
 
-def get_llm_for_text():
+def _company_summary_error(e: BaseException) -> Dict[str, Any]:
+    print(f"[LLM] Error during company summarization: {e}")
+    import traceback
+    traceback.print_exception(type(e), e, e.__traceback__)
+    return {
+        "points": [f"오류: {str(e)}"],
+        "referenced_docs": []
+    }
+
+
+def summarize_company_info(
+    ticker: str,
+    documents: List[Dict[str, Any]],
+    aspect: str  # "business" | "risk" | "roadmap"
+) -> Dict[str, Any]:
     """
-    텍스트 생성용 LLM (JSON 모드 없음)
-    LangSmith 트레이싱을 지원합니다.
+    기업 관련 문서를 LLM으로 요약합니다.
+
+    Returns:
+        {
+            "points": ["포인트1[n]", ...],
+            "referenced_docs": [1, 2]
+        }
     """
+    llm = get_llm()
+
+    if not llm:
+        return _company_summary_fallback(ticker, aspect)
+
+    prompt = _company_summary_prompt(ticker, documents, aspect)
+
     try:
-        from langchain_openai import ChatOpenAI
+        from langchain_core.messages import HumanMessage
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            print("[LLM] WARNING: OPENAI_API_KEY not found. Using fallback mode.")
-            return None
+        response = llm.invoke([HumanMessage(content=prompt)])
+    except Exception as e:
+        return _company_summary_error(e)
+    return _parse_company_summary(ticker, response.content)
 
-        # LangSmith 트레이싱 정보 로그
-        langchain_tracing = os.getenv("LANGCHAIN_TRACING_V2", "false")
-        langchain_project = os.getenv("LANGCHAIN_PROJECT", "default")
-        print(f"[LLM] Creating ChatOpenAI (text mode) - Tracing: {langchain_tracing}, Project: {langchain_project}")
-
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            api_key=api_key,
-            # JSON 모드 없음 - 일반 텍스트 생성
-            metadata={
-                "project": langchain_project,
-                "agent_type": "section_generator"
-            }
-        )
-        return llm
-    except ImportError:
-        print("[LLM] WARNING: langchain-openai not installed. Using fallback mode.")
-        return None
 
+# 기업 요약 배치의 동시 요청 상한 (Runnable.batch max_concurrency)
+_COMPANY_SUMMARY_CONCURRENCY = 8
 
-def generate_section_content(
-    section_name: str,
-    context: Dict[str, Any]
-) -> str:
+
+def summarize_company_info_batch(
+    items: List[Tuple[str, List[Dict[str, Any]], str]]
+) -> List[Dict[str, Any]]:
     """
-    리포트 섹션 콘텐츠를 LLM으로 생성합니다.
+    (ticker, documents, aspect) 목록을 하나의 LLM 인스턴스로 한 번에 요약 (입력 순서대로 반환).
+    Runnable.batch가 요청을 동시에 실행하므로 전체 지연은 Σ(latency)가 아닌 약 max(latency)에 수렴합니다.
+    실패한 항목만 오류 결과로 대체됩니다.
     """
-    llm = get_llm_for_text()  # JSON 모드 없는 LLM 사용
+    if not items:
+        return []
 
+    llm = get_llm()
     if not llm:
-        return f"<p>{section_name} - LLM이 설정되지 않아 콘텐츠를 생성할 수 없습니다.</p>"
+        return [_company_summary_fallback(tk, aspect) for tk, _, aspect in items]
 
-    section_prompts = {
-        "demand_pricing": """Write a section about EV demand and pricing strategy in KOREAN language. Use HTML format.
+    from langchain_core.messages import HumanMessage
 
-**IMPORTANT: Write all content in KOREAN (한글). Only technical terms, company names can be in English.**
+    messages = [
+        [HumanMessage(content=_company_summary_prompt(tk, docs, aspect))]
+        for tk, docs, aspect in items
+    ]
+    responses = llm.batch(
+        messages,
+        config={"max_concurrency": _COMPANY_SUMMARY_CONCURRENCY},
+        return_exceptions=True,
+    )
+    return [
+        _company_summary_error(resp) if isinstance(resp, Exception) else _parse_company_summary(tk, resp.content)
+        for (tk, _, _), resp in zip(items, responses)
+    ]
 
-다음 주제를 다루세요:
-- 세그먼트별 수요 동향
-- ASP(평균 판매가) 변화
-- 가격 인하 전략 영향
-- 마진 압력 요인
 
-**작성 언어**: 반드시 한글로 작성하세요. 기업명, 기술 용어는 영어 가능.
+def get_llm_for_text():
+    """
+    텍스트 생성용 LLM (JSON 모드 없음, 프로세스당 1회 생성 후 재사용)
+    """
+    return _build_llm(False)
+
+
+# 섹션 프롬프트 공통 꼬리 (컨텍스트 삽입 위치 + HTML 출력 형식), {context}는 호출 시 치환
+_SECTION_PROMPT_TAIL = """
 
 컨텍스트에서 관련 정보를 추출하여 작성하세요.
 
 컨텍스트:
-{context}
+{{context}}
 
 HTML로 작성 (제목 h2/h3는 제외, 본문 p/ul/li만 사용, 반드시 한글로):
-<p>수요 동향...</p>
-<ul><li>포인트1</li><li>포인트2</li></ul>""",
+{example_lead}
+<ul><li>포인트1</li><li>포인트2</li></ul>"""
 
-        "policy": """Write a section about EV policy and regulations in KOREAN language. Use HTML format.
+# 리포트 섹션별 프롬프트 ({context} 자리에 컨텍스트 JSON 삽입)
+_SECTION_PROMPTS = {
+    "demand_pricing": """Write a section about EV demand and pricing strategy in KOREAN language. Use HTML format.
+
+**IMPORTANT: Write all content in KOREAN (한글). Only technical terms, company names can be in English.**
+
+다음 주제를 다루세요:
+- 세그먼트별 수요 동향
+- ASP(평균 판매가) 변화
+- 가격 인하 전략 영향
+- 마진 압력 요인
+
+**작성 언어**: 반드시 한글로 작성하세요. 기업명, 기술 용어는 영어 가능."""
+    + _SECTION_PROMPT_TAIL.format(example_lead="<p>수요 동향...</p>"),
+
+    "policy": """Write a section about EV policy and regulations in KOREAN language. Use HTML format.
 
 **IMPORTANT: Write all content in KOREAN (한글). Only policy names, country names can be in English.**
 
@@ -441,18 +533,10 @@ HTML로 작성 (제목 h2/h3는 제외, 본문 p/ul/li만 사용, 반드시 한
 - 탄소 규제 동향
 - 정책 이벤트 타임라인
 
-**작성 언어**: 반드시 한글로 작성하세요. 정책명, 국가명은 영어 가능.
+**작성 언어**: 반드시 한글로 작성하세요. 정책명, 국가명은 영어 가능."""
+    + _SECTION_PROMPT_TAIL.format(example_lead="<p>정책 동향...</p>"),
 
-컨텍스트에서 관련 정보를 추출하여 작성하세요.
-
-컨텍스트:
-{context}
-
-HTML로 작성 (제목 h2/h3는 제외, 본문 p/ul/li만 사용, 반드시 한글로):
-<p>정책 동향...</p>
-<ul><li>포인트1</li><li>포인트2</li></ul>""",
-
-        "battery_supply": """Write a section about battery technology and supply chain in KOREAN language. Use HTML format.
+    "battery_supply": """Write a section about battery technology and supply chain in KOREAN language. Use HTML format.
 
 **IMPORTANT: Write all content in KOREAN (한글). Only technical terms, company names can be in English.**
 
@@ -462,46 +546,224 @@ HTML로 작성 (제목 h2/h3는 제외, 본문 p/ul/li만 사용, 반드시 한
 - 주요 벤더 생산 능력
 - 수직 통합 전략
 
-**작성 언어**: 반드시 한글로 작성하세요. 기업명, 기술 용어(LFP, LMFP, NMC 등)는 영어 가능.
+**작성 언어**: 반드시 한글로 작성하세요. 기업명, 기술 용어(LFP, LMFP, NMC 등)는 영어 가능."""
+    + _SECTION_PROMPT_TAIL.format(example_lead="<p>배터리 기술 동향...</p>"),
+}
 
-컨텍스트에서 관련 정보를 추출하여 작성하세요.
 
-컨텍스트:
-{context}
+def _strip_code_fence(content: str, lang: str = "html") -> str:
+    """응답에서 불필요한 마크다운 코드 블록 제거"""
+    content = content.strip()
+    if content.startswith(f"```{lang}"):
+        content = content[len(lang) + 3:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
 
-HTML로 작성 (제목 h2/h3는 제외, 본문 p/ul/li만 사용, 반드시 한글로):
-<p>배터리 기술 동향...</p>
-<ul><li>포인트1</li><li>포인트2</li></ul>""",
-    }
 
-    prompt = section_prompts.get(section_name, "")
+def _serialize_context(context: Union[Dict[str, Any], str]) -> str:
+    """
+    프롬프트용 컨텍스트 JSON 직렬화 (공백 없는 compact 형식 → 토큰 절약)
+    jsonutil.dumps는 orjson/표준 json 폴백 모두 (",", ":") 구분자를 사용하므로 백엔드와 무관하게 compact
+    이미 직렬화된 문자열이면 그대로 반환하므로, 여러 섹션에 같은 컨텍스트를 쓸 때
+    호출 측에서 한 번만 직렬화해 넘길 수 있습니다 (동일 프롬프트 prefix 유지).
+    """
+    if isinstance(context, str):
+        return context
+
+    from services.jsonutil import dumps
+
+    # NumPy 값도 그대로 직렬화 (orjson 사용 가능 시 가속)
+    return dumps(context)
+
+
+def generate_section_content(
+    section_name: str,
+    context: Union[Dict[str, Any], str]
+) -> str:
+    """
+    리포트 섹션 콘텐츠를 LLM으로 생성합니다.
+    """
+    llm = get_llm_for_text()  # JSON 모드 없는 LLM 사용
+
+    if not llm:
+        return f"<p>{section_name} - LLM이 설정되지 않아 콘텐츠를 생성할 수 없습니다.</p>"
+
+    prompt = _SECTION_PROMPTS.get(section_name, "")
     if not prompt:
         return f"<p>{section_name} 섹션 프롬프트가 정의되지 않았습니다.</p>"
 
     try:
         from langchain_core.messages import HumanMessage
-        import json
 
         # .format() 대신 .replace()로 중괄호 에러 방지
-        context_json = json.dumps(context, ensure_ascii=False, indent=2)
-        prompt_filled = prompt.replace("{context}", context_json)
+        prompt_filled = prompt.replace("{context}", _serialize_context(context))
 
         response = llm.invoke([HumanMessage(content=prompt_filled)])
 
-        # 응답에서 불필요한 마크다운 코드 블록 제거
-        content = response.content.strip()
-        if content.startswith("```html"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-
         # 중복 인용 제거
-        return clean_citations(content)
+        return clean_citations(_strip_code_fence(response.content))
     except Exception as e:
         print(f"[LLM] Error during section generation: {e}")
         import traceback
         traceback.print_exc()
         return f"<p>오류: {str(e)}</p>"
+
+
+# 섹션 개별 생성 요청당 최대 대기 시간(초)
+_SECTION_TIMEOUT_S = 90
+
+def _generate_sections_threaded(
+    section_names: List[str],
+    context: Union[Dict[str, Any], str]
+) -> List[Any]:
+    """
+    섹션별 요청을 스레드 풀에서 병렬 실행 (공유 LLM의 동기 클라이언트 사용).
+    _SECTION_TIMEOUT_S 안에 끝나지 않은 섹션은 TimeoutError로 처리합니다.
+    LLM 미설정/프롬프트 누락 섹션은 generate_section_content의 안내 문구를 그대로 사용합니다.
+    실패한 섹션은 예외 객체로 반환합니다.
+    """
+    llm = get_llm_for_text()
+    outputs: List[Any] = [None] * len(section_names)
+    batch_idx, batch_msgs = [], []
+
+    from langchain_core.messages import HumanMessage
+
+    serialized = _serialize_context(context)
+    for i, name in enumerate(section_names):
+        prompt = _SECTION_PROMPTS.get(name, "")
+        if llm is None or not prompt:
+            outputs[i] = generate_section_content(name, context)
+            continue
+        batch_idx.append(i)
+        batch_msgs.append([HumanMessage(content=prompt.replace("{context}", serialized))])
+
+    if batch_msgs:
+        # 모든 섹션을 동시에 시작하고 공통 마감 시각까지만 대기 (멈춘 요청이 노드 전체를 막지 않도록)
+        pool = ThreadPoolExecutor(max_workers=len(batch_msgs))
+        futures = [pool.submit(llm.invoke, msgs) for msgs in batch_msgs]
+        deadline = time.monotonic() + _SECTION_TIMEOUT_S
+        try:
+            for i, future in zip(batch_idx, futures):
+                try:
+                    resp = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    outputs[i] = clean_citations(_strip_code_fence(resp.content))
+                except Exception as e:  # 시간 초과(TimeoutError) 포함
+                    outputs[i] = e
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return outputs
+
+
+def generate_sections_concurrent(
+    section_names: List[str],
+    context: Union[Dict[str, Any], str]
+) -> Dict[str, str]:
+    """
+    독립적인 섹션들을 개별 요청으로 동시에 생성합니다 (스레드 풀 병렬 호출).
+    캐시된 LLM의 비동기 HTTP 클라이언트는 처음 사용한 이벤트 루프에 묶여 asyncio.run 간 재사용이 불가하므로,
+    이벤트 루프 실행 여부와 관계없이 동기 클라이언트를 스레드에서 호출합니다.
+    섹션별로 _SECTION_TIMEOUT_S 시간 제한을 적용합니다.
+    개별 섹션 실패 시 해당 섹션만 오류 문구로 대체합니다.
+    """
+    if not section_names:
+        return {}
+
+    # 모든 섹션이 같은 컨텍스트 문자열을 공유하도록 한 번만 직렬화
+    context = _serialize_context(context)
+
+    outputs = _generate_sections_threaded(section_names, context)
+
+    results: Dict[str, str] = {}
+    for name, out in zip(section_names, outputs):
+        if isinstance(out, Exception):
+            print(f"[LLM] Section '{name}' generation failed: {out!r}")
+            out = f"<p>{name} 콘텐츠 생성 중 오류가 발생했습니다.</p>"
+        results[name] = out
+    return results
+
+
+# 섹션 배치 요청 프롬프트 골격 (section_prompt_fingerprint에 포함)
+_BATCH_SYSTEM_TMPL = """You write sections of an EV market report, using the shared context below.
+
+공통 컨텍스트:
+{context}"""
+
+_BATCH_PROMPT_TMPL = """Write the following {count} sections in one response.
+
+{instructions}
+
+Return a JSON object whose keys are the SECTION ids and whose values are the section HTML strings:
+{{{shape}}}"""
+
+
+@lru_cache(maxsize=1)
+def section_prompt_fingerprint() -> bytes:
+    """
+    섹션 생성 결과에 영향을 주는 프롬프트 문자열·모델 설정의 digest
+    (report_compiler의 compose 캐시 키에 포함 → 프롬프트/모델 변경 시 이전 캐시 미적중)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    parts = [_LLM_MODEL, repr(_LLM_TEMPERATURE), _SECTION_PROMPT_TAIL, _BATCH_SYSTEM_TMPL, _BATCH_PROMPT_TMPL]
+    parts.extend(f"{name}\0{prompt}" for name, prompt in sorted(_SECTION_PROMPTS.items()))
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.digest()
+
+
+def generate_sections_batch(
+    section_names: List[str],
+    context: Union[Dict[str, Any], str]
+) -> Dict[str, str]:
+    """
+    여러 리포트 섹션을 한 번의 LLM 요청으로 생성합니다.
+    공통 컨텍스트를 한 번만 전달하고, JSON 모드로 {섹션키: HTML} 객체를 받습니다.
+    응답에서 누락된 섹션은 generate_sections_concurrent로 개별·동시 생성합니다.
+
+    Returns:
+        {section_name: html}
+    """
+    llm = get_llm()  # JSON 모드 LLM 사용
+
+    # 배치 프롬프트와 누락 섹션 개별 생성에서 재사용하도록 한 번만 직렬화
+    context = _serialize_context(context)
+
+    if not llm:
+        return generate_sections_concurrent(section_names, context)
+
+    known = [name for name in section_names if name in _SECTION_PROMPTS]
+    results: Dict[str, str] = {}
+
+    if known:
+        # 공통 컨텍스트를 맨 앞(system)에 고정 → 섹션 구성과 무관하게 동일한 prompt prefix 유지 (서버 측 prefix 캐시 활용)
+        shared_prefix = _BATCH_SYSTEM_TMPL.format(context=context)
+        instructions = "\n\n".join(
+            f'<SECTION id="{name}">\n'
+            + _SECTION_PROMPTS[name].replace("{context}", "(위 공통 컨텍스트 참조)")
+            + "\n</SECTION>"
+            for name in known
+        )
+        shape = ", ".join(f'"{name}": "<html>"' for name in known)
+        prompt = _BATCH_PROMPT_TMPL.format(count=len(known), instructions=instructions, shape=shape)
+
+        try:
+            from langchain_core.messages import HumanMessage, SystemMessage
+
+            response = llm.invoke([SystemMessage(content=shared_prefix), HumanMessage(content=prompt)])
+            data = loads(_strip_code_fence(response.content, "json"))
+            for name in known:
+                body = data.get(name) if isinstance(data, dict) else None
+                if isinstance(body, str) and body.strip():
+                    results[name] = clean_citations(_strip_code_fence(body))
+        except Exception as e:
+            print(f"[LLM] Error during batched section generation: {e}")
+
+    missing = [name for name in section_names if name not in results]
+    if missing:
+        print(f"[LLM] Batched response missing sections {missing}, generating individually")
+        results.update(generate_sections_concurrent(missing, context))
+
+    return results
@@ -7,21 +7,29 @@
 핵심 제공 함수
 - build_index(raw_docs) -> index(dict)
 - query(index, query_text, filters=..., top_k=6) -> List[passages]
+- query_batch(index, [(query_text, filters), ...], top_k=6) -> List[List[passages]]
 - make_evidence_map(passages) -> List[dict]
 """
 
 from __future__ import annotations
 from typing import List, Dict, Any, Tuple
 import re
+import heapq
+
+
+# 토큰 패턴 (영문/숫자/한글 연속 구간, 모듈 로드 시 1회 컴파일)
+_TOKEN_RE = re.compile(r"[A-Za-z0-9가-힣]+")
 
 
 def _tokenize(text: str) -> List[str]:
-    return re.findall(r"[A-Za-z0-9가-힣]+", text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 
 def build_index(raw_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    매우 단순한 인메모리 인덱스: {doc_id: {"meta":..., "tokens": [...], "text":...}}
+    매우 단순한 인메모리 인덱스: {doc_id: {"meta":..., "tokens": [...], "tokens_set": frozenset, "text":...}}
+    + 역색인 postings: {token: [문서 위치, ...]} (doc_order의 인덱스)
+    + 메타 필터 facet: by_region / by_company / by_issue_tag = {값: {문서 위치, ...}}
     실제 구현 시: 임베딩 + VectorDB로 교체
     """
     index = {"docs": {}}
@@ -38,20 +46,108 @@ def build_index(raw_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
             "company": d.get("company"),
             "issue_tags": d.get("issue_tags"),
         }
-        index["docs"][doc_id] = {"meta": meta, "tokens": tokens, "text": text}
+        index["docs"][doc_id] = {"meta": meta, "tokens": tokens, "tokens_set": frozenset(tokens), "text": text}
+    _build_postings(index)
     return index
 
 
-def _score(tokens_q: List[str], tokens_d: List[str]) -> float:
+def _build_postings(index: Dict[str, Any]) -> None:
+    """역색인 구성: doc_order(문서 삽입 순서)와 token → [doc_order 위치, ...] postings"""
+    index["doc_order"] = list(index.get("docs", {}))
+    postings: Dict[str, List[int]] = {}
+    for pos, doc_id in enumerate(index["doc_order"]):
+        rec = index["docs"][doc_id]
+        if "tokens_set" not in rec:
+            rec["tokens_set"] = frozenset(rec.get("tokens") or ())
+        for t in rec["tokens_set"]:
+            postings.setdefault(t, []).append(pos)
+    index["postings"] = postings
+
+    # 메타 필터용 facet: {값: {doc_order 위치, ...}} (region / company / issue_tags)
+    by_region: Dict[str, set] = {}
+    by_company: Dict[str, set] = {}
+    by_issue_tag: Dict[str, set] = {}
+    for pos, doc_id in enumerate(index["doc_order"]):
+        meta = index["docs"][doc_id].get("meta") or {}
+        region, company = meta.get("region"), meta.get("company")
+        if isinstance(region, str):
+            by_region.setdefault(region, set()).add(pos)
+        if isinstance(company, str):
+            by_company.setdefault(company, set()).add(pos)
+        for tag in meta.get("issue_tags") or ():
+            if isinstance(tag, str):
+                by_issue_tag.setdefault(tag, set()).add(pos)
+    index["by_region"] = by_region
+    index["by_company"] = by_company
+    index["by_issue_tag"] = by_issue_tag
+
+
+def _passes_filters(meta: Dict[str, Any], filters: Dict[str, Any] | None) -> bool:
+    if not filters:
+        return True
+    # region
+    if "region" in filters and filters["region"]:
+        if meta.get("region") not in filters["region"] and meta.get("region") != "global":
+            return False
+    # company
+    if "company" in filters and filters["company"]:
+        if meta.get("company") not in filters["company"]:
+            return False
+    # issue tags
+    if "issue_tags" in filters and filters["issue_tags"]:
+        tags = meta.get("issue_tags") or []
+        if not any(t in tags for t in filters["issue_tags"]):
+            return False
+    # date range (문자열 비교, 간단 처리)
+    if "date_range" in filters and filters["date_range"]:
+        start, end = filters["date_range"]
+        d = meta.get("date")
+        if d and (d < start or d > end):
+            return False
+    return True
+
+
+def _facet_candidates(
+    index: Dict[str, Any],
+    filters: Dict[str, Any] | None,
+    memo: Dict[Tuple[str, Tuple[Any, ...]], set],
+) -> set | None:
     """
-    아주 단순한 토큰 교집합 스코어
+    region / company / issue_tags 필터를 만족할 수 있는 문서 위치 집합 (facet 교집합)
+    해당 필터가 없으면 None. 같은 필터 값은 memo로 재사용 (query_batch 1회 호출 범위)
+    date_range 등 나머지 조건은 _passes_filters에서 최종 확인합니다.
     """
-    if not tokens_q or not tokens_d:
-        return 0.0
-    set_q = set(tokens_q)
-    set_d = set(tokens_d)
-    inter = len(set_q & set_d)
-    return inter / max(1, len(set_q))
+    if not filters:
+        return None
+    allowed = None
+    for key, facet in (("region", "by_region"), ("company", "by_company"), ("issue_tags", "by_issue_tag")):
+        values = filters.get(key)
+        if not values:
+            continue
+        memo_key = (key, tuple(values))
+        ids = memo.get(memo_key)
+        if ids is None:
+            postings = index[facet]
+            lookup = list(values) + ["global"] if key == "region" else values  # region: global 문서는 항상 통과
+            ids = set().union(*(postings.get(v, ()) for v in lookup))
+            memo[memo_key] = ids
+        allowed = ids if allowed is None else allowed & ids
+    return allowed
+
+
+def _to_passage(index: Dict[str, Any], doc_id: str, s: float) -> Dict[str, Any]:
+    meta = index["docs"][doc_id]["meta"]
+    text = index["docs"][doc_id]["text"]
+    snippet = text[:500] + ("..." if len(text) > 500 else "")
+    return {
+        "doc_id": doc_id,
+        "score": round(float(s), 4),
+        "title": meta.get("title"),
+        "url": meta.get("url"),
+        "date": meta.get("date"),
+        "snippet": snippet,
+        "meta": meta,
+    }
 
 
 def query(
@@ -65,55 +161,51 @@ def query(
     인덱스에서 간단 키워드 스코어링으로 top_k passage 반환.
     filters: {"region": [...], "company": [...], "issue_tags": [...], "date_range": (start, end)}
     """
-    tokens_q = _tokenize(query_text)
-    hits: List[Tuple[str, float]] = []
-
-    def _filter(meta: Dict[str, Any]) -> bool:
-        if not filters:
-            return True
-        # region
-        if "region" in filters and filters["region"]:
-            if meta.get("region") not in filters["region"] and meta.get("region") != "global":
-                return False
-        # company
-        if "company" in filters and filters["company"]:
-            if meta.get("company") not in filters["company"]:
-                return False
-        # issue tags
-        if "issue_tags" in filters and filters["issue_tags"]:
-            tags = meta.get("issue_tags") or []
-            if not any(t in tags for t in filters["issue_tags"]):
-                return False
-        # date range (문자열 비교, 간단 처리)
-        if "date_range" in filters and filters["date_range"]:
-            start, end = filters["date_range"]
-            d = meta.get("date")
-            if d and (d < start or d > end):
-                return False
-        return True
+    return query_batch(index, [(query_text, filters)], top_k=top_k)[0]
 
-    for doc_id, rec in index.get("docs", {}).items():
-        if not _filter(rec["meta"]):
-            continue
-        s = _score(tokens_q, rec["tokens"])
-        if s > 0:
-            hits.append((doc_id, s))
 
-    hits.sort(key=lambda x: x[1], reverse=True)
+def query_batch(
+    index: Dict[str, Any],
+    requests: List[Tuple[str, Dict[str, Any] | None]],
+    *,
+    top_k: int = 6,
+) -> List[List[Dict[str, Any]]]:
+    """
+    여러 (query_text, filters) 요청을 역색인(postings)으로 처리 (질의 토큰을 가진 후보 문서만 스코어링).
+    region / company / issue_tags 필터는 facet 집합 교집합으로 후보를 먼저 좁힙니다.
+    각 요청의 결과는 query()와 동일하며, 입력 순서대로 반환합니다.
+    """
+    if "by_issue_tag" not in index:  # build_index 외부에서 구성한 인덱스 dict 보강
+        _build_postings(index)
+    docs = index["docs"]
+    doc_order = index["doc_order"]
+    postings = index["postings"]
+    facet_memo: Dict[Tuple[str, Tuple[Any, ...]], set] = {}
+
     out = []
-    for doc_id, s in hits[:top_k]:
-        meta = index["docs"][doc_id]["meta"]
-        text = index["docs"][doc_id]["text"]
-        snippet = text[:500] + ("..." if len(text) > 500 else "")
-        out.append({
-            "doc_id": doc_id,
-            "score": round(float(s), 4),
-            "title": meta.get("title"),
-            "url": meta.get("url"),
-            "date": meta.get("date"),
-            "snippet": snippet,
-            "meta": meta,
-        })
+    for query_text, filters in requests:
+        set_q = set(_tokenize(query_text))
+        # 스코어 = |질의 토큰 ∩ 문서 토큰| / |질의 토큰|
+        # 역색인으로 질의 토큰을 하나 이상 가진 문서만 후보로 (나머지 문서는 스코어 0)
+        candidates = set()
+        for t in set_q:
+            candidates.update(postings.get(t, ()))
+        # 메타 필터 facet으로 후보 축소 (필터를 만족할 수 없는 문서는 스코어링 생략)
+        allowed = _facet_candidates(index, filters, facet_memo)
+        if allowed is not None:
+            candidates &= allowed
+
+        hits: List[Tuple[str, float]] = []
+        for pos in sorted(candidates):  # 문서 삽입 순서 유지 (동점 시 기존 정렬 결과와 동일)
+            doc_id = doc_order[pos]
+            rec = docs[doc_id]
+            if not _passes_filters(rec["meta"], filters):
+                continue
+            hits.append((doc_id, len(set_q & rec["tokens_set"]) / len(set_q)))
+
+        # nlargest: O(N log k), sorted(reverse=True)[:k]와 동일한 결과 (동점 순서 포함)
+        top_hits = heapq.nlargest(top_k, hits, key=lambda x: x[1])
+        out.append([_to_passage(index, doc_id, s) for doc_id, s in top_hits])
     return out
 
 
@@ -53,4 +53,6 @@ class AgentState(TypedDict):
     _company_index: Any
     _series: Dict[str, Any]
     _funds: Dict[str, Any]
+    _stock_snapshots_soa: Dict[str, Any]  # stock_snapshots의 컬럼(NumPy 배열, 미설치 시 리스트) 뷰
     _global_ref_counter: int  # 전역 참조 번호 카운터 (각 에이전트가 증가시킴)
+    _done: bool  # report_path 생성 완료 여부 (export_pdf가 설정)
@@ -3,6 +3,7 @@
 LangGraph 기반 EV Market Trend Analysis Workflow
 병렬 실행을 지원하는 Multi-Agent 워크플로우
 """
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from state import AgentState
 
@@ -124,10 +125,21 @@ def create_workflow() -> StateGraph:
     return workflow
 
 
+@lru_cache(maxsize=1)
 def compile_workflow() -> StateGraph:
     """
     워크플로우를 컴파일하여 실행 가능한 상태로 만듭니다.
+    (프로세스당 1회 컴파일 후 재사용, 호출 측마다 그래프를 다시 구성하지 않음)
     """
+    print("[Main] Compiling LangGraph workflow...")
     workflow = create_workflow()
     compiled = workflow.compile()
     return compiled
+
+
+def rebuild_workflow() -> StateGraph:
+    """
+    캐시된 컴파일 결과를 버리고 다시 컴파일합니다. (테스트/노드 코드 리로드용)
+    """
+    compile_workflow.cache_clear()
+    return compile_workflow()